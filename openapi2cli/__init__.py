@@ -1,10 +1,10 @@
 """api2cli - Generate CLI tools from OpenAPI specs."""
 
-__version__ = "0.1.0"
+__version__ = "0.1.1"
 
 from .generator import CLIGenerator, GeneratedCLI
 from .parser import Endpoint, OpenAPIParser, Parameter, ParsedSpec
-from .runtime import APIClient
+from .runtime import APIClient, get_session
 
 __all__ = [
     "OpenAPIParser",
@@ -14,4 +14,5 @@ __all__ = [
     "CLIGenerator",
     "GeneratedCLI",
     "APIClient",
+    "get_session",
 ]
@@ -0,0 +1,23 @@
+"""Compatibility shims for optional backends and older Pythons."""
+
+import json
+import sys
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep a __dict__.
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document, using orjson when it is installed.
+
+    Raises ``json.JSONDecodeError`` on invalid input with either backend.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
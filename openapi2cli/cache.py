@@ -0,0 +1,23 @@
+"""On-disk cache locations."""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+
+def cache_dir(*parts: str) -> Optional[Path]:
+    """Return (and create) a directory under the openapi2cli cache root.
+
+    Honors ``XDG_CACHE_HOME`` and falls back to ``~/.cache/openapi2cli``.
+    Returns ``None`` if ``OPENAPI2CLI_NO_CACHE`` is set or the directory
+    can't be created, so callers can simply skip caching.
+    """
+    if os.environ.get("OPENAPI2CLI_NO_CACHE"):
+        return None
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = Path(base, "openapi2cli", *parts)
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return path
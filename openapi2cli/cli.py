@@ -1,7 +1,9 @@
 """Main CLI for openapi2cli."""
 
+import json
 import sys
 from pathlib import Path
+from typing import List
 
 import click
 
@@ -29,11 +31,16 @@ def main():
 
 
 @main.command()
-@click.argument("spec", type=str)
-@click.option("--name", "-n", required=True, help="Name for the generated CLI")
+@click.argument("spec", type=str, required=False)
+@click.option("--name", "-n", help="Name for the generated CLI")
 @click.option("--output", "-o", type=click.Path(), help="Output file path")
 @click.option("--stdout", is_flag=True, help="Print to stdout instead of file")
-def generate(spec: str, name: str, output: str, stdout: bool):
+@click.option(
+    "--batch",
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON manifest of specs to generate in one run",
+)
+def generate(spec: str, name: str, output: str, stdout: bool, batch: str):
     """Generate a CLI from an OpenAPI spec.
 
     SPEC can be a file path or URL to an OpenAPI 3.x specification.
@@ -42,7 +49,26 @@ def generate(spec: str, name: str, output: str, stdout: bool):
 
         openapi2cli generate petstore.yaml --name petstore
         openapi2cli generate https://api.example.com/openapi.json --name example -o example_cli.py
+        openapi2cli generate --batch manifest.json
     """
+    if batch:
+        if spec or name or output or stdout:
+            raise click.UsageError("--batch cannot be combined with SPEC or other options")
+        try:
+            entries = json.loads(Path(batch).read_text())["entries"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise click.BadParameter(f"invalid manifest: {e}", param_hint="--batch")
+        if not isinstance(entries, list) or not all(isinstance(e, dict) for e in entries):
+            raise click.BadParameter(
+                "invalid manifest: 'entries' must be a list of objects", param_hint="--batch"
+            )
+        sys.exit(1 if _batch_generate(entries) else 0)
+
+    if not spec:
+        raise click.UsageError("Missing argument 'SPEC'.")
+    if not name:
+        raise click.UsageError("Missing option '--name' / '-n'.")
+
     try:
         # Parse the spec
         parser = OpenAPIParser()
@@ -71,6 +97,32 @@ def generate(spec: str, name: str, output: str, stdout: bool):
         sys.exit(1)
 
 
+def _batch_generate(entries: List[dict]) -> int:
+    """Generate a CLI for each manifest entry; return the number that failed.
+
+    Each entry needs ``spec`` and ``name`` and may set ``output`` (default
+    ``{name}_cli.py``). One failing entry doesn't stop the others.
+    """
+    parser = OpenAPIParser()
+    generator = CLIGenerator()
+    failures = 0
+
+    for entry in entries:
+        try:
+            name = entry["name"]
+            parsed = parser.parse(entry["spec"])
+            cli = generator.generate(parsed, name=name)
+            output_path = Path(entry.get("output") or f"{name}_cli.py")
+            cli.save(output_path)
+            click.echo(f"Saved {name} to: {output_path}", err=True)
+        except Exception as e:
+            failures += 1
+            label = entry.get("name", "?") if isinstance(entry, dict) else "?"
+            click.echo(f"Error ({label}): {e}", err=True)
+
+    return failures
+
+
 @main.command()
 @click.argument("spec", type=str)
 def inspect(spec: str):
@@ -82,31 +134,35 @@ def inspect(spec: str):
         parser = OpenAPIParser()
         parsed = parser.parse(spec)
 
-        click.echo(f"\n📋 {parsed.title} v{parsed.version}")
-        click.echo(f"   {parsed.description[:100]}..." if len(parsed.description) > 100 else f"   {parsed.description}")
-        click.echo(f"\n🌐 Base URL: {parsed.base_url}")
+        # Collect the report and write it once rather than line by line
+        out = []
+        out.append(f"\n📋 {parsed.title} v{parsed.version}")
+        out.append(f"   {parsed.description[:100]}..." if len(parsed.description) > 100 else f"   {parsed.description}")
+        out.append(f"\n🌐 Base URL: {parsed.base_url}")
 
         # Auth schemes
         if parsed.auth_schemes:
-            click.echo("\n🔐 Authentication:")
+            out.append("\n🔐 Authentication:")
             for scheme in parsed.auth_schemes:
-                click.echo(f"   - {scheme.name}: {scheme.type}")
+                out.append(f"   - {scheme.name}: {scheme.type}")
 
         # Endpoints by tag
-        grouped = parsed.group_by_tag()
-        click.echo(f"\n📡 Endpoints ({len(parsed.endpoints)} total):")
+        grouped = parsed.grouped_by_tag
+        out.append(f"\n📡 Endpoints ({len(parsed.endpoints)} total):")
 
         for tag, endpoints in sorted(grouped.items()):
-            click.echo(f"\n   [{tag}]")
+            out.append(f"\n   [{tag}]")
             for ep in endpoints[:5]:  # Show first 5
                 params = ", ".join(p.name for p in ep.parameters[:3])
                 if len(ep.parameters) > 3:
                     params += "..."
-                click.echo(f"   • {ep.method:6} {ep.path}")
+                out.append(f"   • {ep.method:6} {ep.path}")
                 if params:
-                    click.echo(f"           params: {params}")
+                    out.append(f"           params: {params}")
             if len(endpoints) > 5:
-                click.echo(f"   ... and {len(endpoints) - 5} more")
+                out.append(f"   ... and {len(endpoints) - 5} more")
+
+        click.echo("\n".join(out))
 
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
@@ -1,16 +1,62 @@
 """CLI code generator."""
 
+import io
+import os
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Union
-
-from jinja2 import Template
+from typing import TYPE_CHECKING, List, Optional, Union
 
+from ._compat import DATACLASS_SLOTS
+from .cache import cache_dir
 from .parser import AuthScheme, Endpoint, ParsedSpec
 
+if TYPE_CHECKING:
+    import click
+    import jinja2
 
-@dataclass
+# One pass over a name: split camelCase, turn '_', ' ' and '.' into
+# hyphens, and drop anything else that isn't alphanumeric or a hyphen.
+_SANITIZE_RE = re.compile(r'([a-z])([A-Z])|([_ .])|[^a-zA-Z0-9-]')
+_DASHES_RE = re.compile(r'-+')
+# Option name -> Python identifier
+_VAR_NAME_TABLE = str.maketrans({'-': '_', '.': '_'})
+
+
+def _sanitize_repl(match: re.Match) -> str:
+    """Replacement for a single _SANITIZE_RE match."""
+    if match.group(1):
+        return f"{match.group(1)}-{match.group(2)}"
+    if match.group(3):
+        return '-'
+    return ''
+
+
+# OpenAPI type -> Python/Click type; arrays and objects are passed as JSON strings
+_TYPE_MAP = {
+    'integer': 'int',
+    'number': 'float',
+    'boolean': 'bool',
+    'array': 'str',
+    'object': 'str',
+}
+
+
+@lru_cache(maxsize=4096)
+def _sanitize_name(name: str) -> str:
+    """Sanitize a name for use as a CLI command/option."""
+    name = _SANITIZE_RE.sub(_sanitize_repl, name)
+    # Collapse consecutive hyphens and trim them from the ends
+    return _DASHES_RE.sub('-', name).strip('-').lower()
+
+
+def _map_type(schema_type: str) -> str:
+    """Map OpenAPI type to Python/Click type."""
+    return _TYPE_MAP.get(schema_type, 'str')
+
+
+@dataclass(**DATACLASS_SLOTS)
 class CLIOption:
     """A CLI option/argument."""
 
@@ -21,9 +67,14 @@ class CLIOption:
     help: str = ""
     is_flag: bool = False
     multiple: bool = False
+    # Python identifier for the option in the generated command function
+    var_name: str = field(default="", init=False, repr=False)
 
+    def __post_init__(self) -> None:
+        self.var_name = self.name.replace("--", "").translate(_VAR_NAME_TABLE)
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class CLICommand:
     """A CLI command."""
 
@@ -35,7 +86,7 @@ class CLICommand:
     has_body: bool = False
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class CLIGroup:
     """A group of CLI commands (tag)."""
 
@@ -55,10 +106,17 @@ class GeneratedCLI:
     groups: List[CLIGroup] = field(default_factory=list)
     global_options: List[CLIOption] = field(default_factory=list)
     auth_schemes: List[AuthScheme] = field(default_factory=list)
+    # Prefix for the generated CLI's auth environment variables
+    env_prefix: str = field(default="", init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.env_prefix = self.name.upper().replace("-", "_")
 
     def to_python(self) -> str:
         """Generate Python code for the CLI."""
-        return CLI_TEMPLATE.render(cli=self)
+        if os.environ.get("OPENAPI2CLI_JINJA"):
+            return _jinja_environment().get_template("cli.j2").render(cli=self)
+        return _render_cli(self)
 
     def to_standalone_script(self) -> str:
         """Generate a standalone executable script."""
@@ -68,10 +126,25 @@ class GeneratedCLI:
     def save(self, path: Union[Path, str]) -> None:
         """Save the generated CLI to a file."""
         path = Path(path)
-        code = self.to_standalone_script()
-        path.write_text(code)
-        # Make executable
-        path.chmod(0o755)
+        data = self.to_standalone_script().encode("utf-8")
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+        with os.fdopen(fd, "wb") as f:
+            # Make executable; the os.open mode is masked by the umask
+            # and ignored when overwriting an existing file
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, 0o755)
+            else:
+                path.chmod(0o755)
+            f.write(data)
+
+    def load(self) -> "click.Group":
+        """Run the generated code in a fresh namespace and return its ``cli`` group.
+
+        Lets callers invoke the CLI in-process without saving a script.
+        """
+        namespace = {"__name__": f"openapi2cli_generated_{_sanitize_name(self.name)}"}
+        exec(compile(self.to_python(), f"<openapi2cli:{self.name}>", "exec"), namespace)
+        return namespace["cli"]
 
 
 class CLIGenerator:
@@ -83,7 +156,7 @@ class CLIGenerator:
         global_options = self._generate_global_options(spec)
 
         # Group endpoints by tag and generate command groups
-        grouped = spec.group_by_tag()
+        grouped = spec.grouped_by_tag
         groups = []
 
         for tag, endpoints in grouped.items():
@@ -151,7 +224,7 @@ class CLIGenerator:
             commands.append(cmd)
 
         return CLIGroup(
-            name=self._sanitize_name(tag),
+            name=_sanitize_name(tag),
             help=f"Commands for {tag}",
             commands=commands,
         )
@@ -171,7 +244,7 @@ class CLIGenerator:
         for param in endpoint.parameters:
             add_option(CLIOption(
                 name=param.cli_name,
-                param_type=self._map_type(param.schema_type),
+                param_type=_map_type(param.schema_type),
                 required=param.required,
                 default=str(param.default) if param.default is not None else None,
                 help=param.description or f"{param.name} parameter",
@@ -184,8 +257,8 @@ class CLIGenerator:
             for prop_name, prop_schema in endpoint.request_body.properties.items():
                 required = prop_name in endpoint.request_body.required_props
                 add_option(CLIOption(
-                    name=f"--{self._sanitize_name(prop_name)}",
-                    param_type=self._map_type(prop_schema.get('type', 'string')),
+                    name=f"--{_sanitize_name(prop_name)}",
+                    param_type=_map_type(prop_schema.get('type', 'string')),
                     required=required,
                     help=prop_schema.get('description', f"{prop_name} field"),
                 ))
@@ -206,30 +279,244 @@ class CLIGenerator:
             has_body=has_body,
         )
 
-    def _sanitize_name(self, name: str) -> str:
-        """Sanitize a name for use as a CLI command/option."""
-        # Convert camelCase to kebab-case
-        name = re.sub(r'([a-z])([A-Z])', r'\1-\2', name)
-        # Replace underscores, spaces, dots with hyphens
-        name = name.replace('_', '-').replace(' ', '-').replace('.', '-')
-        # Remove invalid characters
-        name = re.sub(r'[^a-zA-Z0-9-]', '', name)
-        # Remove consecutive hyphens
-        name = re.sub(r'-+', '-', name)
-        # Remove leading/trailing hyphens
-        name = name.strip('-')
-        return name.lower()
-
-    def _map_type(self, schema_type: str) -> str:
-        """Map OpenAPI type to Python/Click type."""
-        mapping = {
-            'integer': 'int',
-            'number': 'float',
-            'boolean': 'bool',
-            'array': 'str',  # JSON string for arrays
-            'object': 'str',  # JSON string for objects
-        }
-        return mapping.get(schema_type, 'str')
+
+# Direct code generation. Static parts of the generated module are plain
+# strings; per-group/command code is written straight into a buffer. The
+# output matches CLI_TEMPLATE_STR below, which is kept as a fallback
+# (set OPENAPI2CLI_JINJA=1) while the two are compared in tests.
+
+_CLI_IMPORTS = '''
+
+Auto-generated by openapi2cli. Do not edit manually.
+"""
+
+import json
+import os
+import sys
+from typing import Optional
+
+import click
+
+try:
+    from rich.console import Console
+    from rich.table import Table
+    RICH_AVAILABLE = True
+except ImportError:
+    RICH_AVAILABLE = False
+
+
+# Configuration
+BASE_URL = "'''
+
+_CLI_AUTH = '''"
+
+
+def get_auth_headers(api_key: Optional[str] = None, token: Optional[str] = None) -> dict:
+    """Get authentication headers."""
+    headers = {}
+
+    # Try CLI args first, then env vars
+    key = api_key or os.environ.get(ENV_PREFIX + "_API_KEY")
+    tok = token or os.environ.get(ENV_PREFIX + "_TOKEN")
+
+    if tok:
+        headers["Authorization"] = "Bearer " + tok
+    elif key:'''
+
+_CLI_HELPERS = '''
+
+    return headers
+
+
+def format_output(data, output_format: str):
+    """Format output based on requested format."""
+    if output_format == "json":
+        click.echo(json.dumps(data, indent=2))
+    elif output_format == "raw":
+        click.echo(data)
+    elif output_format == "table" and RICH_AVAILABLE:
+        console = Console()
+        if isinstance(data, list) and data:
+            table = Table()
+            first = data[0]
+            if isinstance(first, dict):
+                for key in first.keys():
+                    table.add_column(str(key))
+                for item in data:
+                    if isinstance(item, dict):
+                        table.add_row(*[str(v) for v in item.values()])
+            else:
+                table.add_column("value")
+                for item in data:
+                    table.add_row(str(item))
+            console.print(table)
+        elif isinstance(data, dict):
+            table = Table()
+            table.add_column("Key")
+            table.add_column("Value")
+            for k, v in data.items():
+                table.add_row(str(k), str(v))
+            console.print(table)
+        else:
+            console.print(data)
+    else:
+        click.echo(json.dumps(data, indent=2))
+
+
+def make_request(
+    method: str,
+    path: str,
+    base_url: str,
+    params: dict = None,
+    json_data: dict = None,
+    headers: dict = None,
+    path_params: dict = None,
+):
+    """Make an HTTP request to the API."""
+    # Imported here so --help and usage errors don't load the HTTP stack.
+    import requests
+
+    if path_params:
+        for key, value in path_params.items():
+            path = path.replace("{" + key + "}", str(value))
+
+    url = base_url.rstrip("/") + path
+
+    try:
+        response = requests.request(
+            method=method,
+            url=url,
+            params=params,
+            json=json_data,
+            headers=headers,
+            timeout=30,
+        )
+        response.raise_for_status()
+
+        try:
+            return response.json()
+        except json.JSONDecodeError:
+            return response.text
+
+    except requests.exceptions.RequestException as e:
+        click.echo("Error: " + str(e), err=True)
+        sys.exit(1)
+
+
+@click.group()
+@click.option("--output", "-o", default="json", help="Output format (json, table, raw)")
+@click.option("--base-url", default=BASE_URL, help="API base URL")
+@click.option("--api-key", envvar=ENV_PREFIX + "_API_KEY", help="API key")
+@click.option("--token", envvar=ENV_PREFIX + "_TOKEN", help="Bearer token")
+@click.version_option(version="'''
+
+_CLI_ROOT = '''")
+@click.pass_context
+def cli(ctx, output, base_url, api_key, token):
+    """'''
+
+_CLI_ROOT_BODY = '''"""
+    ctx.ensure_object(dict)
+    ctx.obj["output"] = output
+    ctx.obj["base_url"] = base_url
+    ctx.obj["headers"] = get_auth_headers(api_key, token)
+
+'''
+
+_CLI_COMMAND_BODY = '''"""
+    path_params = {}
+    query_params = {}
+    body_data = {}'''
+
+_CLI_MAIN = '''
+
+
+def main():
+    """Main entry point."""
+    cli()
+
+
+if __name__ == "__main__":
+    main()'''
+
+
+def _render_cli(cli: "GeneratedCLI") -> str:
+    """Render the Python source of a generated CLI."""
+    buf = io.StringIO()
+    write = buf.write
+
+    write(f'\n"""{cli.name} - Generated CLI for {cli.description}')
+    write(_CLI_IMPORTS)
+    write(f'{cli.base_url}"\nENV_PREFIX = "{cli.env_prefix}')
+    write(_CLI_AUTH)
+    for scheme in cli.auth_schemes:
+        if scheme.type == "apiKey" and scheme.location == "header":
+            write(f'\n        headers["{scheme.param_name}"] = key')
+    if not cli.auth_schemes:
+        write('\n        headers["X-API-Key"] = key')
+    write(_CLI_HELPERS)
+    write(cli.version)
+    write(_CLI_ROOT)
+    write(cli.description)
+    write(_CLI_ROOT_BODY)
+
+    for group in cli.groups:
+        group_var = group.name.replace("-", "_")
+        func_prefix = group_var.replace(".", "_")
+        write(f'\n\n@cli.group()\ndef {group_var}():\n    """{group.help}"""\n    pass\n\n')
+        for cmd in group.commands:
+            _render_command(write, cmd, group_var, func_prefix)
+        write("\n")
+
+    write(_CLI_MAIN)
+    return buf.getvalue()
+
+
+def _render_command(write, cmd: "CLICommand", group_var: str, func_prefix: str) -> None:
+    """Write one command function of a generated CLI."""
+    write(f'\n\n@{group_var}.command("{cmd.name}")')
+    for opt in cmd.options:
+        write(f'\n@click.option("{opt.name}"')
+        if opt.required:
+            write(", required=True")
+        if opt.default:
+            write(f', default="{opt.default}"')
+        write(f', help="{opt.help}")')
+
+    func_name = cmd.name.replace("-", "_").replace(".", "_")
+    write(f"\n@click.pass_context\ndef {func_prefix}_{func_name}(ctx")
+    for opt in cmd.options:
+        write(", " + opt.var_name)
+    write(f'):\n    """{cmd.help}')
+    write(_CLI_COMMAND_BODY)
+
+    is_path_template = "{" in cmd.path
+    for opt in cmd.options:
+        bare = opt.name.replace("--", "")
+        var_name = opt.var_name
+        write(f"\n    if {var_name} is not None:")
+        if "id" in opt.name.lower() and is_path_template:
+            write(f'\n        path_params["{bare.replace("-", "")}"] = {var_name}')
+        elif opt.name == "--data":
+            write(f"\n        body_data = json.loads({var_name})")
+        elif cmd.has_body:
+            write(f'\n        body_data["{bare.replace("-", "_")}"] = {var_name}')
+        else:
+            write(f'\n        query_params["{bare}"] = {var_name}')
+
+    write(
+        "\n\n    result = make_request(\n"
+        f'        method="{cmd.method}",\n'
+        f'        path="{cmd.path}",\n'
+        '        base_url=ctx.obj["base_url"],\n'
+        "        params=query_params or None,\n"
+        "        json_data=body_data or None,\n"
+        '        headers=ctx.obj["headers"],\n'
+        "        path_params=path_params or None,\n"
+        "    )\n"
+        "\n"
+        '    format_output(result, ctx.obj["output"])\n'
+    )
 
 
 # Template for generated CLI - use raw strings to avoid escaping issues
@@ -245,7 +532,6 @@ import sys
 from typing import Optional
 
 import click
-import requests
 
 try:
     from rich.console import Console
@@ -257,7 +543,7 @@ except ImportError:
 
 # Configuration
 BASE_URL = "{{ cli.base_url }}"
-ENV_PREFIX = "{{ cli.name.upper().replace('-', '_') }}"
+ENV_PREFIX = "{{ cli.env_prefix }}"
 
 
 def get_auth_headers(api_key: Optional[str] = None, token: Optional[str] = None) -> dict:
@@ -328,6 +614,9 @@ def make_request(
     path_params: dict = None,
 ):
     """Make an HTTP request to the API."""
+    # Imported here so --help and usage errors don't load the HTTP stack.
+    import requests
+
     if path_params:
         for key, value in path_params.items():
             path = path.replace("{" + key + "}", str(value))
@@ -383,14 +672,14 @@ def {{ group.name | replace("-", "_") }}():
 @click.option("{{ opt.name }}"{% if opt.required %}, required=True{% endif %}{% if opt.default %}, default="{{ opt.default }}"{% endif %}, help="{{ opt.help | replace('"', '\\"') }}")
 {%- endfor %}
 @click.pass_context
-def {{ group.name | replace("-", "_") | replace(".", "_") }}_{{ cmd.name | replace("-", "_") | replace(".", "_") }}(ctx{% for opt in cmd.options %}, {{ opt.name | replace("--", "") | replace("-", "_") | replace(".", "_") }}{% endfor %}):
+def {{ group.name | replace("-", "_") | replace(".", "_") }}_{{ cmd.name | replace("-", "_") | replace(".", "_") }}(ctx{% for opt in cmd.options %}, {{ opt.var_name }}{% endfor %}):
     """{{ cmd.help | replace('"', '\\"') }}"""
     path_params = {}
     query_params = {}
     body_data = {}
 
     {%- for opt in cmd.options %}
-    {%- set var_name = opt.name | replace("--", "") | replace("-", "_") %}
+    {%- set var_name = opt.var_name %}
     if {{ var_name }} is not None:
         {%- if "id" in opt.name.lower() and "{" in cmd.path %}
         path_params["{{ opt.name | replace("--", "") | replace("-", "") }}"] = {{ var_name }}
@@ -427,4 +716,24 @@ if __name__ == "__main__":
     main()
 '''
 
-CLI_TEMPLATE = Template(CLI_TEMPLATE_STR)
+
+@lru_cache(maxsize=None)
+def _jinja_environment() -> "jinja2.Environment":
+    """Build (once, on first use) the Jinja environment for the template renderer.
+
+    Only needed when ``OPENAPI2CLI_JINJA`` is set, so Jinja isn't imported
+    otherwise. Compiled template code is cached on disk so later runs skip
+    the parse/compile step. Set ``OPENAPI2CLI_DEBUG`` to re-check the
+    template source on every render.
+    """
+    from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+
+    directory = cache_dir("jinja")
+    bytecode_cache = None
+    if directory is not None:
+        bytecode_cache = FileSystemBytecodeCache(str(directory), pattern="cli-%s.cache")
+    return Environment(
+        loader=DictLoader({"cli.j2": CLI_TEMPLATE_STR}),
+        auto_reload=bool(os.environ.get("OPENAPI2CLI_DEBUG")),
+        bytecode_cache=bytecode_cache,
+    )
@@ -1,14 +1,72 @@
 """OpenAPI spec parser."""
 
+import contextlib
+import hashlib
+import importlib.metadata
 import json
+import os
+import pickle
 import re
+import tempfile
+from collections import defaultdict
 from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
-import requests
 import yaml
 
+from . import __version__
+from ._compat import DATACLASS_SLOTS, json_loads
+from .cache import cache_dir
+
+try:
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as YAMLLoader
+
+
+# camelCase word boundary, e.g. "petId" -> "pet-Id"
+_CAMEL_RE = re.compile(r'([a-z])([A-Z])')
+_UNDERSCORE_TABLE = str.maketrans('_', '-')
+
+# Read buffer for spec files; large specs are several MB.
+_BUFFER_SIZE = 128 * 1024
+
+_URL_SCHEMES = ('http://', 'https://')
+
+_HTTP_METHODS = frozenset(('get', 'post', 'put', 'patch', 'delete', 'head', 'options'))
+
+_SUFFIX_FORMATS = {'.yaml': 'yaml', '.yml': 'yaml', '.json': 'json'}
+
+# Bump when parse output changes in a way the cache key below can't see
+# (e.g. a fix in another module) so old pickles are not loaded.
+_SPEC_CACHE_VERSION = 3
+
+
+@lru_cache(maxsize=None)
+def _spec_cache_key() -> bytes:
+    """Salt for spec cache keys.
+
+    Covers the installed package version and this module's source, so a
+    release or any parser change invalidates previously cached specs.
+    """
+    try:
+        version = importlib.metadata.version('openapi2cli')
+    except importlib.metadata.PackageNotFoundError:
+        version = __version__
+    try:
+        source = Path(__file__).read_bytes()
+    except OSError:
+        source = b''
+    source_hash = hashlib.sha256(source).hexdigest()
+    return f'openapi2cli-{version}-spec-{_SPEC_CACHE_VERSION}-{source_hash}'.encode()
+
+
+def _looks_like_json(content: Union[str, bytes]) -> bool:
+    """Check whether spec content is a JSON document rather than YAML."""
+    return content.lstrip()[:1] in ('{', '[', b'{', b'[')
+
 
 @dataclass
 class Parameter:
@@ -20,18 +78,18 @@ class Parameter:
     description: str = ""
     schema_type: str = "string"
     default: Any = None
-    enum: List[str] = field(default_factory=list)
+    enum: Tuple[str, ...] = ()
 
-    @property
+    @cached_property
     def cli_name(self) -> str:
         """Convert to CLI option name."""
         # petId -> pet-id, api_key -> api-key
-        name = re.sub(r'([a-z])([A-Z])', r'\1-\2', self.name)
-        name = name.replace('_', '-').lower()
+        name = _CAMEL_RE.sub(r'\1-\2', self.name)
+        name = name.translate(_UNDERSCORE_TABLE).lower()
         return f"--{name}"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RequestBody:
     """Request body schema."""
 
@@ -41,7 +99,7 @@ class RequestBody:
     required_props: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AuthScheme:
     """Authentication scheme."""
 
@@ -66,12 +124,12 @@ class Endpoint:
     request_body: Optional[RequestBody] = None
     security: List[str] = field(default_factory=list)
 
-    @property
+    @cached_property
     def cli_name(self) -> str:
         """Generate CLI command name."""
         if self.operation_id:
             # getPetById -> get-pet-by-id -> get (simplified)
-            name = re.sub(r'([a-z])([A-Z])', r'\1-\2', self.operation_id)
+            name = _CAMEL_RE.sub(r'\1-\2', self.operation_id)
             name = name.lower()
 
             # Simplify common patterns
@@ -105,56 +163,122 @@ class ParsedSpec:
     endpoints: List[Endpoint] = field(default_factory=list)
     auth_schemes: List[AuthScheme] = field(default_factory=list)
 
-    def group_by_tag(self) -> Dict[str, List[Endpoint]]:
-        """Group endpoints by their tags."""
-        groups: Dict[str, List[Endpoint]] = {}
+    @cached_property
+    def grouped_by_tag(self) -> Dict[str, List[Endpoint]]:
+        """Endpoints grouped by their tags, computed once per spec."""
+        groups: Dict[str, List[Endpoint]] = defaultdict(list)
 
         for endpoint in self.endpoints:
             tags = endpoint.tags or ["default"]
             for tag in tags:
-                if tag not in groups:
-                    groups[tag] = []
                 groups[tag].append(endpoint)
 
-        return groups
+        return dict(groups)
+
+    def group_by_tag(self) -> Dict[str, List[Endpoint]]:
+        """Group endpoints by their tags."""
+        return self.grouped_by_tag
 
 
 class OpenAPIParser:
     """Parser for OpenAPI 3.x specifications."""
 
-    def parse(self, source: Union[str, Path]) -> ParsedSpec:
-        """Parse an OpenAPI spec from a file path or URL."""
-        raw = self._load_spec(source)
-        return self._parse_spec(raw)
+    def __init__(self) -> None:
+        # Resolved $ref targets for the spec currently being parsed
+        self._ref_cache: Dict[str, dict] = {}
+
+    def parse(self, source: Union[str, Path, bytes]) -> ParsedSpec:
+        """Parse an OpenAPI spec from a file path, URL or raw spec content.
+
+        ``bytes`` are taken as the spec document itself (JSON or YAML).
+        Parsed specs are cached on disk, keyed by a hash of the raw spec
+        content, so repeat runs against the same spec skip parsing.
+        """
+        if isinstance(source, (bytes, bytearray)):
+            data, fmt = bytes(source), ''
+        else:
+            data, fmt = self._read_spec(source)
+
+        cache_path = self._cache_path(data)
+        if cache_path is not None:
+            cached = self._load_cached(cache_path)
+            if cached is not None:
+                return cached
 
-    def _load_spec(self, source: Union[str, Path]) -> dict:
-        """Load spec from file or URL."""
+        spec = self._parse_spec(self._decode_spec(data, fmt))
+
+        if cache_path is not None:
+            self._store_cached(cache_path, spec)
+        return spec
+
+    def _read_spec(self, source: Union[str, Path]) -> Tuple[bytes, str]:
+        """Read raw spec bytes from file or URL, with a format hint."""
         if isinstance(source, Path):
             source = str(source)
 
         # Check if URL
-        if source.startswith(('http://', 'https://')):
-            response = requests.get(source, timeout=30)
-            response.raise_for_status()
-            content = response.text
-            # Detect format
-            if source.endswith('.yaml') or source.endswith('.yml'):
-                return yaml.safe_load(content)
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                return yaml.safe_load(content)
+        if source.startswith(_URL_SCHEMES):
+            import requests
+
+            with requests.get(source, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                data = response.raw.read(decode_content=True)
+            fmt = 'yaml' if source.endswith(('.yaml', '.yml')) else ''
+            return data, fmt
 
         # Local file
         path = Path(source)
-        content = path.read_text()
-
-        if path.suffix in ('.yaml', '.yml'):
-            return yaml.safe_load(content)
-        return json.loads(content)
+        with open(path, 'rb', buffering=_BUFFER_SIZE) as f:
+            data = f.read()
+        return data, _SUFFIX_FORMATS.get(path.suffix, '')
+
+    def _decode_spec(self, data: bytes, fmt: str) -> dict:
+        """Decode raw spec bytes; without a format hint, sniff the content."""
+        if fmt == 'json':
+            return json_loads(data)
+        if fmt != 'yaml' and _looks_like_json(data):
+            try:
+                return json_loads(data)
+            except json.JSONDecodeError:
+                pass
+        # The loader takes bytes and detects UTF-8/UTF-16 itself, so no decoded copy.
+        return yaml.load(data, Loader=YAMLLoader)
+
+    def _cache_path(self, data: bytes) -> Optional[Path]:
+        """Get the cache file for a spec, or None if caching is disabled."""
+        directory = cache_dir('specs')
+        if directory is None:
+            return None
+        digest = hashlib.sha256(_spec_cache_key())
+        digest.update(data)
+        return directory / f'{digest.hexdigest()}.pickle'
+
+    def _load_cached(self, cache_path: Path) -> Optional[ParsedSpec]:
+        """Load a previously parsed spec; stale or corrupt entries are ignored."""
+        try:
+            with open(cache_path, 'rb') as f:
+                spec = pickle.load(f)
+        except Exception:
+            return None
+        return spec if isinstance(spec, ParsedSpec) else None
+
+    def _store_cached(self, cache_path: Path, spec: ParsedSpec) -> None:
+        """Write a parsed spec to the cache (best effort, atomic rename)."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(spec, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
 
     def _parse_spec(self, raw: dict) -> ParsedSpec:
         """Parse raw spec dict into ParsedSpec."""
+        self._ref_cache = {}
         info = raw.get('info', {})
 
         # Get base URL from servers
@@ -184,12 +308,12 @@ class OpenAPIParser:
 
         for path, methods in paths.items():
             # Handle path-level parameters
-            path_params = self._parse_parameters(
-                methods.get('parameters', []), spec
-            )
+            path_params = tuple(self._parse_parameters(
+                methods.get('parameters', ()), spec
+            ))
 
             for method, details in methods.items():
-                if method in ('get', 'post', 'put', 'patch', 'delete', 'head', 'options'):
+                if method in _HTTP_METHODS:
                     endpoint = self._parse_endpoint(
                         path, method.upper(), details, spec, path_params
                     )
@@ -203,14 +327,14 @@ class OpenAPIParser:
         method: str,
         details: dict,
         spec: dict,
-        path_params: List[Parameter]
+        path_params: Tuple[Parameter, ...]
     ) -> Endpoint:
         """Parse a single endpoint."""
         # Parse parameters (combine path-level and operation-level)
-        params = path_params.copy()
-        params.extend(
-            self._parse_parameters(details.get('parameters', []), spec)
-        )
+        params = [
+            *path_params,
+            *self._parse_parameters(details.get('parameters', ()), spec),
+        ]
 
         # Parse request body
         request_body = None
@@ -234,35 +358,25 @@ class OpenAPIParser:
             security=security,
         )
 
-    def _parse_parameters(self, params: list, spec: dict) -> List[Parameter]:
+    def _parse_parameters(self, params: list, spec: dict) -> Iterator[Parameter]:
         """Parse parameters."""
-        result = []
-
         for param in params:
-            # Handle $ref
-            if '$ref' in param:
-                param = self._resolve_ref(param['$ref'], spec)
-
-            schema = param.get('schema', {})
+            param = self._deref(param, spec)
+            schema = self._deref(param.get('schema', {}), spec)
 
-            result.append(Parameter(
+            yield Parameter(
                 name=param.get('name', ''),
                 location=param.get('in', 'query'),
                 required=param.get('required', False),
                 description=param.get('description', ''),
                 schema_type=schema.get('type', 'string'),
                 default=schema.get('default'),
-                enum=schema.get('enum', []),
-            ))
-
-        return result
+                enum=tuple(schema.get('enum') or ()),
+            )
 
     def _parse_request_body(self, body: dict, spec: dict) -> RequestBody:
         """Parse request body."""
-        # Handle $ref
-        if '$ref' in body:
-            body = self._resolve_ref(body['$ref'], spec)
-
+        body = self._deref(body, spec)
         content = body.get('content', {})
 
         # Prefer JSON
@@ -270,11 +384,7 @@ class OpenAPIParser:
         if content_type not in content:
             content_type = next(iter(content.keys()), 'application/json')
 
-        schema = content.get(content_type, {}).get('schema', {})
-
-        # Handle $ref in schema
-        if '$ref' in schema:
-            schema = self._resolve_ref(schema['$ref'], spec)
+        schema = self._deref(content.get(content_type, {}).get('schema', {}), spec)
 
         properties = schema.get('properties', {})
         required_props = schema.get('required', [])
@@ -308,18 +418,32 @@ class OpenAPIParser:
 
         return result
 
+    def _deref(self, obj: dict, spec: dict) -> dict:
+        """Return the object a $ref points to, or the object itself."""
+        if '$ref' in obj:
+            return self._resolve_ref(obj['$ref'], spec)
+        return obj
+
     def _resolve_ref(self, ref: str, spec: dict) -> dict:
         """Resolve a $ref pointer."""
-        if not ref.startswith('#/'):
-            return {}
-
-        parts = ref[2:].split('/')
-        current = spec
-
-        for part in parts:
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                return {}
-
-        return current if isinstance(current, dict) else {}
+        cached = self._ref_cache.get(ref)
+        if cached is not None:
+            return cached
+
+        resolved = {}
+        if ref.startswith('#/'):
+            current = spec
+            for part in ref[2:].split('/'):
+                if isinstance(current, dict) and part in current:
+                    current = current[part]
+                else:
+                    current = None
+                    break
+            if isinstance(current, dict):
+                resolved = current
+
+        # Follow chained refs; the placeholder breaks reference cycles
+        self._ref_cache[ref] = {}
+        resolved = self._deref(resolved, spec)
+        self._ref_cache[ref] = resolved
+        return resolved
@@ -1,15 +1,174 @@
 """Runtime for executing API calls and running generated CLIs."""
 
+import json
+import os
+import re
+import runpy
 import subprocess
 import sys
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
-import requests
+from ._compat import DATACLASS_SLOTS, json_loads
 
+if TYPE_CHECKING:
+    import click
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 
-@dataclass
+_PATH_PARAM_RE = re.compile(r"\{([^}]+)\}")
+
+_SESSION: Optional["requests.Session"] = None
+
+# The shared session's scheme-wide adapter, used for hosts without their own.
+_DEFAULT_ADAPTER: Optional["HTTPAdapter"] = None
+
+# Per-host adapters mounted on the shared session, keyed by URL prefix, with
+# the (pool_size, retries) they are configured for. They live as long as the
+# process, so only the first _MAX_HOST_ADAPTERS hosts get one; later hosts
+# share the default adapter's pools.
+_HOST_ADAPTERS: Dict[str, Tuple["HTTPAdapter", int, int]] = {}
+_MAX_HOST_ADAPTERS = 64
+_MOUNT_LOCK = threading.Lock()
+
+
+class _RejectCookies(DefaultCookiePolicy):
+    """Cookie policy for the shared session: never store or send cookies."""
+
+    def set_ok(self, cookie, request):
+        """Refuse to store any cookie."""
+        return False
+
+    def return_ok(self, cookie, request):
+        """Refuse to send any cookie."""
+        return False
+
+
+def get_session() -> "requests.Session":
+    """Return the session owning the connection pools shared by all API clients.
+
+    Reusing its adapters keeps TCP/TLS connections alive across clients.
+    Callers may mount their own adapters on it (e.g. with retries); they
+    take precedence over the per-host pools and the ``pool_size``/``retries``
+    of clients created afterwards, for every host they cover. It never
+    stores cookies: each client sends requests through its own session on
+    top of these adapters, so one client's cookies can't leak to another.
+    """
+    global _SESSION, _DEFAULT_ADAPTER
+    if _SESSION is None:
+        with _MOUNT_LOCK:
+            if _SESSION is None:
+                # requests is imported on first use so CLIRunner/CLIResult
+                # users don't pay for the HTTP stack.
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.headers["Content-Type"] = "application/json"
+                session.cookies.set_policy(_RejectCookies())
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _DEFAULT_ADAPTER = adapter
+                _SESSION = session
+    return _SESSION
+
+
+def _client_session(base_url: str, pool_size: int, retries: int) -> "requests.Session":
+    """Create a client session with its own cookie jar on top of the shared pools.
+
+    The adapters (and so their connection pools) are shared; the mapping
+    holding them is a per-client copy, because the shared one changes as
+    hosts are mounted while requests look adapters up without a lock.
+    """
+    import requests
+
+    shared = get_session()
+    _mount_host_adapter(shared, base_url, pool_size, retries)
+    session = requests.Session()
+    session.headers["Content-Type"] = "application/json"
+    with _MOUNT_LOCK:
+        session.adapters = OrderedDict(shared.adapters)
+    return session
+
+
+def _host_prefix(base_url: str) -> Optional[str]:
+    """Return the ``scheme://host/`` prefix adapters are mounted on, if any."""
+    parts = urlsplit(base_url)
+    if not parts.scheme or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+def _retry_policy(retries: int) -> "Retry":
+    """Retry failed connections and 502/503/504 responses with a short backoff."""
+    from urllib3.util.retry import Retry
+
+    if retries <= 0:
+        return Retry(0, read=False)
+    return Retry(
+        total=retries,
+        backoff_factor=0.1,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    )
+
+
+def _mount_host_adapter(
+    session: "requests.Session", base_url: str, pool_size: int, retries: int
+) -> None:
+    """Give ``base_url``'s host its own connection pool on ``session``.
+
+    Hosts served by an adapter a caller mounted (on the host's prefix or a
+    shorter one such as ``https://``) keep it. A host's own adapter is
+    reconfigured in place, so clients already using it keep doing so, and
+    its settings are only ever raised: the pool and retry count are the
+    largest any client asked for.
+    """
+    prefix = _host_prefix(base_url)
+    if prefix is None:
+        return
+    with _MOUNT_LOCK:
+        current = session.get_adapter(prefix)
+        mounted = _HOST_ADAPTERS.get(prefix)
+        if mounted is not None and current is mounted[0]:
+            adapter, mounted_pool, mounted_retries = mounted
+            pool_size = max(pool_size, mounted_pool)
+            retries = max(retries, mounted_retries)
+            if retries != mounted_retries:
+                adapter.max_retries = _retry_policy(retries)
+            if pool_size != mounted_pool:
+                # Drop the old pools' idle connections; new requests use the
+                # bigger pools straight away.
+                previous = adapter.poolmanager
+                adapter.init_poolmanager(1, pool_size)
+                previous.clear()
+            _HOST_ADAPTERS[prefix] = (adapter, pool_size, retries)
+            return
+        if current is not _DEFAULT_ADAPTER or len(_HOST_ADAPTERS) >= _MAX_HOST_ADAPTERS:
+            return
+
+        from requests.adapters import HTTPAdapter
+
+        # The adapter only ever talks to one host, so one pool is enough.
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=_retry_policy(retries)
+        )
+        session.mount(prefix, adapter)
+        _HOST_ADAPTERS[prefix] = (adapter, pool_size, retries)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class CLIResult:
     """Result of running a CLI command."""
 
@@ -18,9 +177,27 @@ class CLIResult:
     error: str = ""
 
 
+@lru_cache(maxsize=1024)
+def _split_path(path: str) -> Tuple[str, ...]:
+    """Split a path template into literals (even indexes) and parameter names (odd)."""
+    return tuple(_PATH_PARAM_RE.split(path))
+
+
 class APIClient:
     """HTTP client for making API requests."""
 
+    __slots__ = (
+        "base_url",
+        "auth_header",
+        "auth_value",
+        "api_key_param",
+        "api_key_value",
+        "timeout",
+        "pool_size",
+        "session",
+        "_base_params",
+    )
+
     def __init__(
         self,
         base_url: str,
@@ -29,38 +206,60 @@ class APIClient:
         api_key_param: Optional[str] = None,
         api_key_value: Optional[str] = None,
         timeout: int = 30,
+        pool_size: int = 20,
+        retries: int = 0,
     ):
+        """Create a client for ``base_url``.
+
+        ``pool_size`` caps the pooled keep-alive connections to the API host;
+        raise it when more threads than that call the host concurrently.
+        ``retries`` retries failed connections and 502/503/504 responses
+        (idempotent methods only) with a short backoff. Clients of the same
+        host share its pool, sized for the most demanding of them; neither
+        setting applies to hosts served by an adapter mounted on
+        :func:`get_session`.
+        """
         self.base_url = base_url.rstrip("/")
         self.auth_header = auth_header
         self.auth_value = auth_value
         self.api_key_param = api_key_param
         self.api_key_value = api_key_value
         self.timeout = timeout
-        self.session = requests.Session()
-
-    def _get_headers(self) -> dict:
-        """Get request headers including auth."""
-        headers = {"Content-Type": "application/json"}
+        self.pool_size = pool_size
+        # Clients share connection pools but not sessions, so the auth header
+        # and cookies live on the client's own session.
+        self.session = _client_session(self.base_url, pool_size, retries)
+        if auth_header and auth_value:
+            self.session.headers[auth_header] = auth_value
 
-        if self.auth_header and self.auth_value:
-            headers[self.auth_header] = self.auth_value
+        # The API key params are the same for every request; build them once.
+        self._base_params = {}
+        if api_key_param and api_key_value:
+            self._base_params[api_key_param] = api_key_value
 
-        return headers
+    def _get_headers(self) -> dict:
+        """Get the headers sent with every request, including auth."""
+        return self.session.headers
 
     def _get_params(self, params: Optional[dict]) -> dict:
         """Get query parameters including API key if configured."""
-        result = params.copy() if params else {}
-
-        if self.api_key_param and self.api_key_value:
-            result[self.api_key_param] = self.api_key_value
-
-        return result
+        if params:
+            return {**params, **self._base_params}
+        return self._base_params
 
     def _build_url(self, path: str, path_params: Optional[dict] = None) -> str:
         """Build full URL with path parameter substitution."""
         if path_params:
-            for key, value in path_params.items():
-                path = path.replace(f"{{{key}}}", str(value))
+            parts = _split_path(path)
+            if len(parts) > 1:
+                segments = list(parts)
+                for i in range(1, len(parts), 2):
+                    name = parts[i]
+                    if name in path_params:
+                        segments[i] = str(path_params[name])
+                    else:
+                        segments[i] = f"{{{name}}}"
+                path = "".join(segments)
 
         return f"{self.base_url}{path}"
 
@@ -71,10 +270,9 @@ class APIClient:
         params: Optional[dict] = None,
         json_data: Optional[dict] = None,
         path_params: Optional[dict] = None,
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Make an HTTP request."""
         url = self._build_url(path, path_params)
-        headers = self._get_headers()
         query_params = self._get_params(params)
 
         return self.session.request(
@@ -82,18 +280,53 @@ class APIClient:
             url=url,
             params=query_params or None,
             json=json_data,
-            headers=headers,
             timeout=self.timeout,
         )
 
+    def batch(
+        self, calls: Iterable[dict], max_workers: int = 8
+    ) -> List["requests.Response"]:
+        """Make several requests concurrently.
+
+        Each item of ``calls`` holds keyword arguments for :meth:`request`.
+        Responses are returned in the order of ``calls``. Concurrency is
+        capped at the pool size of the adapter serving the host, so threads
+        never wait for a free connection.
+        """
+        adapter = self.session.get_adapter(self.base_url)
+        pool_size = getattr(adapter, "_pool_maxsize", self.pool_size)
+        workers = max(1, min(max_workers, pool_size))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda call: self.request(**call), calls))
+
+    def request_json(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        json_data: Optional[dict] = None,
+        path_params: Optional[dict] = None,
+    ) -> Any:
+        """Make an HTTP request and return the decoded JSON body.
+
+        Raises ``requests.HTTPError`` for error responses. The raw bytes are
+        parsed directly (with orjson when installed), skipping the decoded
+        text copy that ``Response.json()`` builds first.
+        """
+        response = self.request(method, path, params, json_data, path_params)
+        response.raise_for_status()
+        if not response.content:
+            return None
+        return json_loads(response.content)
+
     def get(
         self,
         path: str,
         params: Optional[dict] = None,
         path_params: Optional[dict] = None,
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Make a GET request."""
-        return self.request("GET", path, params=params, path_params=path_params)
+        return self.request("GET", path, params, None, path_params)
 
     def post(
         self,
@@ -101,11 +334,9 @@ class APIClient:
         json_data: Optional[dict] = None,
         params: Optional[dict] = None,
         path_params: Optional[dict] = None,
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Make a POST request."""
-        return self.request(
-            "POST", path, params=params, json_data=json_data, path_params=path_params
-        )
+        return self.request("POST", path, params, json_data, path_params)
 
     def put(
         self,
@@ -113,20 +344,18 @@ class APIClient:
         json_data: Optional[dict] = None,
         params: Optional[dict] = None,
         path_params: Optional[dict] = None,
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Make a PUT request."""
-        return self.request(
-            "PUT", path, params=params, json_data=json_data, path_params=path_params
-        )
+        return self.request("PUT", path, params, json_data, path_params)
 
     def delete(
         self,
         path: str,
         params: Optional[dict] = None,
         path_params: Optional[dict] = None,
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Make a DELETE request."""
-        return self.request("DELETE", path, params=params, path_params=path_params)
+        return self.request("DELETE", path, params, None, path_params)
 
     def patch(
         self,
@@ -134,11 +363,77 @@ class APIClient:
         json_data: Optional[dict] = None,
         params: Optional[dict] = None,
         path_params: Optional[dict] = None,
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Make a PATCH request."""
-        return self.request(
-            "PATCH", path, params=params, json_data=json_data, path_params=path_params
-        )
+        return self.request("PATCH", path, params, json_data, path_params)
+
+
+# Keep subprocess on its posix_spawn() fast path instead of fork()+exec(),
+# which copies the page tables of the (large) parent. CPython only takes that
+# path with close_fds=False and no preexec_fn, cwd, pass_fds or new session,
+# so none of those may be passed where these options are used. The trade-off:
+# descriptors are non-inheritable by default (PEP 446), but any the parent has
+# made inheritable (os.set_inheritable(), or ones it inherited itself) stay
+# open in every spawned CLI and session worker.
+_SPAWN_OPTIONS = {"close_fds": False}
+
+# Source of the persistent worker started by CLIRunner.session(). It loads the
+# generated script once, then answers one JSON request per stdin line with one
+# JSON response per stdout line. The CLI's own output is captured per call so
+# it never reaches the protocol stream.
+# Seconds a single CLI invocation may take, in a subprocess or the worker.
+_RUN_TIMEOUT = 60
+
+_WORKER_SOURCE = """
+import contextlib, io, json, os, runpy, sys, traceback
+
+script = sys.argv[1]
+sys.argv = [script]
+try:
+    cli = runpy.run_path(script, run_name="__openapi2cli_worker__")["cli"]
+except Exception:
+    cli = None
+out, requests = sys.stdout, sys.stdin
+sys.stdin = open(os.devnull)
+out.write(json.dumps({"ready": cli is not None}) + "\\n")
+out.flush()
+if cli is None:
+    sys.exit(0)
+
+prog_name = os.path.basename(script)
+for line in requests:
+    request = json.loads(line)
+    env = request["env"] or {}
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code = 0
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            cli.main(request["args"], prog_name=prog_name)
+    except SystemExit as exc:
+        code = exc.code
+        if code is None:
+            exit_code = 0
+        elif isinstance(code, int):
+            exit_code = code
+        else:
+            stderr.write(str(code) + "\\n")
+            exit_code = 1
+    except Exception:
+        stderr.write(traceback.format_exc())
+        exit_code = 1
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    response = {"exit_code": exit_code, "stdout": stdout.getvalue()}
+    response["stderr"] = stderr.getvalue()
+    out.write(json.dumps(response) + "\\n")
+    out.flush()
+"""
 
 
 class CLIRunner:
@@ -146,21 +441,57 @@ class CLIRunner:
 
     def __init__(self, script_path: Union[Path, str]):
         self.script_path = Path(script_path)
+        self._worker: Optional[subprocess.Popen] = None
+        self._command: Optional["click.Command"] = None
+
+    @contextmanager
+    def session(self) -> Iterator["CLIRunner"]:
+        """Keep one interpreter running the CLI for every ``run`` in the block.
+
+        The generated script is imported once and each call is dispatched to
+        its ``cli`` group, avoiding interpreter startup per invocation. If the
+        script has no ``cli`` object, ``run`` keeps spawning a process per call.
+        Calls have the same time limit as a one-shot ``run``: on expiry the
+        worker is killed, ``subprocess.TimeoutExpired`` is raised and later
+        calls spawn a process each.
+        """
+        worker = subprocess.Popen(
+            [sys.executable, "-c", _WORKER_SOURCE, str(self.script_path)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            **_SPAWN_OPTIONS,
+        )
+        try:
+            try:
+                ready = json.loads(self._read_line(worker) or "{}")
+            except subprocess.TimeoutExpired:
+                ready = {}
+            if ready.get("ready"):
+                self._worker = worker
+            yield self
+        finally:
+            self._worker = None
+            worker.stdin.close()
+            worker.stdout.close()
+            worker.wait()
 
     def run(self, args: List[str], env: Optional[dict] = None) -> CLIResult:
         """Run the CLI with given arguments."""
-        import os
+        if self._worker is not None:
+            return self._run_in_worker(args, env)
 
-        full_env = os.environ.copy()
-        if env:
-            full_env.update(env)
+        full_env = {**os.environ, **env} if env else None
 
         result = subprocess.run(
             [sys.executable, str(self.script_path)] + args,
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
             env=full_env,
-            timeout=60,
+            timeout=_RUN_TIMEOUT,
+            **_SPAWN_OPTIONS,
         )
 
         return CLIResult(
@@ -168,3 +499,72 @@ class CLIRunner:
             output=result.stdout,
             error=result.stderr,
         )
+
+    def invoke(self, args: List[str], env: Optional[dict] = None) -> CLIResult:
+        """Run the CLI inside this process with click's test runner.
+
+        Much faster than :meth:`run` as no interpreter is started, but the
+        generated code shares this process (its imports and ``sys.modules``).
+        The script is loaded on first use and reused afterwards.
+        """
+        from click.testing import CliRunner
+
+        if self._command is None:
+            namespace = runpy.run_path(str(self.script_path), run_name="__openapi2cli_invoke__")
+            self._command = namespace["cli"]
+
+        try:
+            runner = CliRunner(mix_stderr=False)
+        except TypeError:  # click >= 8.2 always keeps stderr separate
+            runner = CliRunner()
+        result = runner.invoke(
+            self._command, args, env=env, prog_name=self.script_path.name
+        )
+        error = result.stderr
+        if result.exc_info and not isinstance(result.exception, SystemExit):
+            # Report crashes like a subprocess would, with the traceback.
+            error += "".join(traceback.format_exception(*result.exc_info))
+
+        return CLIResult(
+            exit_code=result.exit_code,
+            output=result.stdout,
+            error=error,
+        )
+
+    def _run_in_worker(self, args: List[str], env: Optional[dict]) -> CLIResult:
+        """Dispatch one invocation to the session worker."""
+        worker = self._worker
+        worker.stdin.write(json.dumps({"args": list(args), "env": env}) + "\n")
+        worker.stdin.flush()
+        try:
+            line = self._read_line(worker)
+        except subprocess.TimeoutExpired:
+            # Like run(): the hung process is gone; later calls spawn one each.
+            self._worker = None
+            raise
+        if not line:
+            raise RuntimeError(f"CLI worker for {self.script_path} exited unexpectedly")
+        response = json.loads(line)
+
+        return CLIResult(
+            exit_code=response["exit_code"],
+            output=response["stdout"],
+            error=response["stderr"],
+        )
+
+    def _read_line(self, worker: subprocess.Popen) -> str:
+        """Read one line from the worker, killing it after ``_RUN_TIMEOUT`` seconds.
+
+        Raises ``subprocess.TimeoutExpired`` when the worker doesn't answer.
+        """
+        lines: List[str] = []
+        reader = threading.Thread(
+            target=lambda: lines.append(worker.stdout.readline()), daemon=True
+        )
+        reader.start()
+        reader.join(_RUN_TIMEOUT)
+        if reader.is_alive():
+            worker.kill()
+            reader.join()
+            raise subprocess.TimeoutExpired(worker.args, _RUN_TIMEOUT)
+        return lines[0]
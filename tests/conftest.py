@@ -0,0 +1,126 @@
+"""Shared pytest configuration."""
+
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from pytest_httpserver import HTTPServer
+from werkzeug.wrappers import Request, Response
+
+from openapi2cli.generator import CLIGenerator
+from openapi2cli.parser import OpenAPIParser
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PETSTORE_YAML = FIXTURES / "petstore.yaml"
+HTTPBIN_JSON = FIXTURES / "httpbin.json"
+SHM = Path("/dev/shm")
+
+
+def pytest_addoption(parser):
+    """Add the --run-network opt-in."""
+    parser.addoption(
+        "--run-network",
+        action="store_true",
+        default=False,
+        help="run tests marked 'network' that talk to real internet services",
+    )
+
+
+def pytest_configure(config):
+    """Parse specs for real in every test run.
+
+    A warm spec cache in ~/.cache would hide parser changes, so it is
+    disabled for the whole session (including spawned subprocesses).
+    """
+    os.environ["OPENAPI2CLI_NO_CACHE"] = "1"
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests that need the internet unless --run-network is given."""
+    if config.getoption("--run-network"):
+        return
+    skip = pytest.mark.skip(reason="needs --run-network")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def petstore_spec():
+    """Parsed Petstore spec, shared by all tests (treat as read-only)."""
+    return OpenAPIParser().parse(PETSTORE_YAML)
+
+
+@pytest.fixture(scope="session")
+def petstore_ops(petstore_spec):
+    """Petstore endpoints keyed by operationId."""
+    return {e.operation_id: e for e in petstore_spec.endpoints if e.operation_id}
+
+
+@pytest.fixture(scope="session")
+def httpbin_spec():
+    """Parsed httpbin spec, shared by all tests (treat as read-only)."""
+    return OpenAPIParser().parse(HTTPBIN_JSON)
+
+
+@pytest.fixture(scope="session")
+def httpbin_cli_script(tmp_path_factory, httpbin_spec):
+    """Path of a CLI script generated once from the httpbin spec.
+
+    On Linux the script lives on tmpfs (/dev/shm) so the suite doesn't
+    write it to disk; elsewhere it falls back to pytest's tmp_path.
+    """
+    if sys.platform == "linux" and SHM.is_dir() and os.access(SHM, os.W_OK):
+        directory = Path(tempfile.mkdtemp(prefix="openapi2cli-", dir=SHM))
+    else:
+        directory = None
+    script = (directory or tmp_path_factory.mktemp("cli")) / "httpbin_cli.py"
+    CLIGenerator().generate(httpbin_spec, name="httpbin").save(script)
+    yield script
+    if directory is not None:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _echo(request: Request) -> Response:
+    """Answer like httpbin's /get, /post and /anything: echo the request back."""
+    body = {
+        "args": request.args.to_dict(),
+        "headers": dict(request.headers),
+        "json": request.get_json(silent=True),
+        "method": request.method,
+        "url": request.url,
+    }
+    return Response(json.dumps(body), content_type="application/json")
+
+
+def _set_cookies(request: Request) -> Response:
+    """Answer like httpbin's /cookies/set: set each query arg as a cookie."""
+    response = _echo(request)
+    for name, value in request.args.items():
+        response.set_cookie(name, value)
+    return response
+
+
+@pytest.fixture(scope="session")
+def httpbin_stub():
+    """Local stand-in for https://httpbin.org, shared by the whole session.
+
+    Serves the httpbin fixture at ``/spec.json`` and echoes every other
+    request back as JSON.
+    """
+    server = HTTPServer(threaded=True)
+    server.expect_request("/spec.json").respond_with_data(
+        HTTPBIN_JSON.read_bytes(), content_type="application/json"
+    )
+    server.expect_request("/cookies/set").respond_with_handler(_set_cookies)
+    server.expect_request(re.compile("/.*")).respond_with_handler(_echo)
+    server.start()
+    yield server
+    server.clear()
+    if server.is_running():
+        server.stop()
@@ -1,5 +1,6 @@
 """End-to-end tests for openapi2cli."""
 
+import json
 import subprocess
 import sys
 from pathlib import Path
@@ -7,6 +8,39 @@ from pathlib import Path
 import pytest
 
 FIXTURES = Path(__file__).parent / "fixtures"
+PETSTORE_YAML = FIXTURES / "petstore.yaml"
+HTTPBIN_JSON = FIXTURES / "httpbin.json"
+
+# (spec path, CLI name) pairs generated once per test session.
+LOCAL_SPECS = [
+    (PETSTORE_YAML, "petstore"),
+    (HTTPBIN_JSON, "httpbin"),
+]
+
+
+@pytest.fixture(scope="session")
+def generated_clis(tmp_path_factory):
+    """Generate a CLI for every local spec with one ``generate --batch`` run.
+
+    Returns a mapping of CLI name to the generated script path.
+    """
+    out_dir = tmp_path_factory.mktemp("generated")
+    scripts = {name: out_dir / f"{name}_cli.py" for _, name in LOCAL_SPECS}
+    manifest = out_dir / "manifest.json"
+    manifest.write_text(json.dumps({"entries": [
+        {"spec": str(spec), "name": name, "output": str(scripts[name])}
+        for spec, name in LOCAL_SPECS
+    ]}))
+
+    result = subprocess.run(
+        [sys.executable, "-m", "openapi2cli", "generate", "--batch", str(manifest)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+
+    assert result.returncode == 0, result.stderr.decode("utf-8", "replace")
+    return scripts
 
 
 class TestCLIEndToEnd:
@@ -18,53 +52,91 @@ class TestCLIEndToEnd:
             [
                 sys.executable, "-m", "openapi2cli",
                 "generate",
-                str(FIXTURES / "petstore.yaml"),
+                str(PETSTORE_YAML),
                 "--name", "petstore",
                 "--output", str(tmp_path / "petstore_cli.py")
             ],
-            capture_output=True,
-            text=True
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
         )
 
-        assert result.returncode == 0
+        assert result.returncode == 0, result.stderr.decode("utf-8", "replace")
         assert (tmp_path / "petstore_cli.py").exists()
 
-    def test_generate_from_url(self, tmp_path):
-        """Can generate CLI from a URL."""
+    def test_generate_batch(self, generated_clis):
+        """generate --batch writes every CLI listed in the manifest."""
+        for script in generated_clis.values():
+            assert script.exists()
+
+    @pytest.mark.parametrize("manifest", [
+        "not json",
+        {"specs": []},
+        {"entries": 5},
+        {"entries": ["petstore.yaml"]},
+    ], ids=["bad-json", "no-entries", "entries-not-list", "entry-not-object"])
+    def test_generate_batch_rejects_malformed_manifest(self, tmp_path, manifest):
+        """A malformed manifest is a usage error, not a traceback."""
+        path = tmp_path / "manifest.json"
+        path.write_text(manifest if isinstance(manifest, str) else json.dumps(manifest))
+
+        result = subprocess.run(
+            [sys.executable, "-m", "openapi2cli", "generate", "--batch", str(path)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+
+        assert result.returncode == 2
+        assert "invalid manifest" in result.stderr
+        assert "Traceback" not in result.stderr
+
+    def test_generate_requires_name(self):
+        """generate without --batch still needs --name."""
         result = subprocess.run(
             [
                 sys.executable, "-m", "openapi2cli",
                 "generate",
-                "https://httpbin.org/spec.json",
-                "--name", "httpbin",
-                "--output", str(tmp_path / "httpbin_cli.py")
+                str(PETSTORE_YAML),
             ],
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True
         )
 
-        assert result.returncode == 0
-        assert (tmp_path / "httpbin_cli.py").exists()
+        assert result.returncode == 2
+        assert "--name" in result.stderr
 
-    def test_generated_cli_is_executable(self, tmp_path):
-        """Generated CLI can be executed."""
-        # Generate
-        subprocess.run(
+    def test_generate_from_url(self, tmp_path, httpbin_stub):
+        """Can generate CLI from a URL."""
+        result = subprocess.run(
             [
                 sys.executable, "-m", "openapi2cli",
                 "generate",
-                str(FIXTURES / "httpbin.json"),
+                httpbin_stub.url_for("/spec.json"),
                 "--name", "httpbin",
                 "--output", str(tmp_path / "httpbin_cli.py")
             ],
-            capture_output=True,
-            text=True
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
         )
 
+        assert result.returncode == 0, result.stderr.decode("utf-8", "replace")
+        assert (tmp_path / "httpbin_cli.py").exists()
+
+    def test_generated_cli_is_executable(self, generated_clis):
+        """Generated CLI can be executed."""
+        script = generated_clis["httpbin"]
+
         # Run help
         result = subprocess.run(
-            [sys.executable, str(tmp_path / "httpbin_cli.py"), "--help"],
-            capture_output=True,
+            [sys.executable, str(script), "--help"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True
         )
 
@@ -72,42 +144,53 @@ class TestCLIEndToEnd:
         assert "usage" in result.stdout.lower() or "httpbin" in result.stdout.lower()
 
     @pytest.mark.integration
-    def test_generated_cli_makes_api_call(self, tmp_path):
+    def test_generated_cli_makes_api_call(self, generated_clis, httpbin_stub):
         """Generated CLI actually calls the API."""
-        # Generate
-        subprocess.run(
+        script = generated_clis["httpbin"]
+
+        # Call GET /get endpoint on the local stub
+        result = subprocess.run(
             [
-                sys.executable, "-m", "openapi2cli",
-                "generate",
-                str(FIXTURES / "httpbin.json"),
-                "--name", "httpbin",
-                "--output", str(tmp_path / "httpbin_cli.py")
+                sys.executable,
+                str(script),
+                "--base-url", httpbin_stub.url_for("/"),
+                "http-methods", "get-get"
             ],
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True
         )
 
-        # Call GET /get endpoint
+        assert result.returncode == 0, result.stderr
+        assert "/get" in result.stdout
+
+    def test_inspect_command(self):
+        """openapi2cli inspect summarizes a spec."""
         result = subprocess.run(
             [
-                sys.executable,
-                str(tmp_path / "httpbin_cli.py"),
-                "get",
-                "--output", "json"
+                sys.executable, "-m", "openapi2cli",
+                "inspect",
+                str(PETSTORE_YAML),
             ],
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True
         )
 
-        # Should either succeed or show helpful error
-        if result.returncode == 0:
-            assert "url" in result.stdout.lower() or "httpbin" in result.stdout.lower()
+        assert result.returncode == 0
+        assert "OpenAPI Petstore" in result.stdout
+        assert "[pet]" in result.stdout
+        assert "/pet/{petId}" in result.stdout
 
     def test_help_command(self):
         """openapi2cli --help works."""
         result = subprocess.run(
             [sys.executable, "-m", "openapi2cli", "--help"],
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True
         )
 
@@ -118,8 +201,9 @@ class TestCLIEndToEnd:
         """openapi2cli --version works."""
         result = subprocess.run(
             [sys.executable, "-m", "openapi2cli", "--version"],
-            capture_output=True,
-            text=True
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
 
         assert result.returncode == 0
@@ -129,26 +213,16 @@ class TestRealWorldSpecs:
     """Tests with real-world OpenAPI specs."""
 
     @pytest.mark.integration
-    def test_petstore_full_workflow(self, tmp_path):
+    def test_petstore_full_workflow(self, generated_clis):
         """Full workflow with Petstore spec."""
-        # Generate CLI
-        gen_result = subprocess.run(
-            [
-                sys.executable, "-m", "openapi2cli",
-                "generate",
-                str(FIXTURES / "petstore.yaml"),
-                "--name", "petstore",
-                "--output", str(tmp_path / "petstore")
-            ],
-            capture_output=True,
-            text=True
-        )
-        assert gen_result.returncode == 0
+        script = generated_clis["petstore"]
 
         # Check CLI structure
         help_result = subprocess.run(
-            [sys.executable, str(tmp_path / "petstore"), "--help"],
-            capture_output=True,
+            [sys.executable, str(script), "--help"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True
         )
         assert help_result.returncode == 0
@@ -158,6 +232,7 @@ class TestRealWorldSpecs:
         assert "pet" in output
 
     @pytest.mark.integration
+    @pytest.mark.network
     def test_httpbin_actual_request(self, tmp_path):
         """Makes actual request to httpbin."""
         # Generate
@@ -169,14 +244,17 @@ class TestRealWorldSpecs:
                 "--name", "httpbin",
                 "--output", str(tmp_path / "httpbin")
             ],
-            capture_output=True,
-            text=True
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
 
         # First get help to see what commands are available
         help_result = subprocess.run(
             [sys.executable, str(tmp_path / "httpbin"), "--help"],
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
             timeout=30
         )
@@ -195,8 +273,9 @@ class TestRealWorldSpecs:
                 str(tmp_path / "httpbin"),
                 "http-methods", "get-get"
             ],
-            capture_output=True,
-            text=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             timeout=30
         )
 
@@ -1,50 +1,52 @@
 """Tests for CLI code generation."""
 
-from pathlib import Path
+import os
+import stat
+import sys
 
-from openapi2cli.generator import CLIGenerator, GeneratedCLI
-from openapi2cli.parser import OpenAPIParser
+import pytest
 
-FIXTURES = Path(__file__).parent / "fixtures"
+from openapi2cli.generator import (
+    CLICommand,
+    CLIGenerator,
+    CLIGroup,
+    CLIOption,
+    GeneratedCLI,
+)
+from openapi2cli.parser import AuthScheme
 
 
-class TestCLIGenerator:
-    """Tests for the CLI generator."""
+@pytest.fixture(scope="session")
+def petstore_cli(petstore_spec):
+    """CLI generated from the Petstore spec (treat as read-only)."""
+    return CLIGenerator().generate(petstore_spec, name="petstore")
 
-    def test_generates_cli_structure(self):
-        """Generates a CLI with command groups."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
 
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="petstore")
+@pytest.fixture(scope="session")
+def petstore_code(petstore_cli):
+    """Python source of the generated Petstore CLI."""
+    return petstore_cli.to_python()
 
-        assert isinstance(cli, GeneratedCLI)
-        assert cli.name == "petstore"
-        assert len(cli.groups) > 0
 
-    def test_generates_group_for_each_tag(self):
-        """Creates a command group for each tag."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
+class TestCLIGenerator:
+    """Tests for the CLI generator."""
 
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="petstore")
+    def test_generates_cli_structure(self, petstore_cli):
+        """Generates a CLI with command groups."""
+        assert isinstance(petstore_cli, GeneratedCLI)
+        assert petstore_cli.name == "petstore"
+        assert len(petstore_cli.groups) > 0
 
-        group_names = [g.name for g in cli.groups]
+    def test_generates_group_for_each_tag(self, petstore_cli):
+        """Creates a command group for each tag."""
+        group_names = [g.name for g in petstore_cli.groups]
         assert "pet" in group_names
         assert "store" in group_names
         assert "user" in group_names
 
-    def test_generates_commands_for_endpoints(self):
+    def test_generates_commands_for_endpoints(self, petstore_cli):
         """Creates commands for each endpoint."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
-
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="petstore")
-
-        pet_group = next(g for g in cli.groups if g.name == "pet")
+        pet_group = next(g for g in petstore_cli.groups if g.name == "pet")
         command_names = [c.name for c in pet_group.commands]
 
         # Should have commands for pet operations
@@ -52,15 +54,9 @@ class TestCLIGenerator:
         # e.g., "add", "get", "update", "delete", "find-by-status"
         assert any("get" in name or "find" in name for name in command_names)
 
-    def test_generates_options_for_parameters(self):
+    def test_generates_options_for_parameters(self, petstore_cli):
         """Creates CLI options for endpoint parameters."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
-
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="petstore")
-
-        pet_group = next(g for g in cli.groups if g.name == "pet")
+        pet_group = next(g for g in petstore_cli.groups if g.name == "pet")
 
         # Find a command with parameters (e.g., get pet by ID)
         get_cmd = next(
@@ -73,15 +69,9 @@ class TestCLIGenerator:
             option_names = [o.name for o in get_cmd.options]
             assert len(option_names) > 0
 
-    def test_generates_options_for_request_body(self):
+    def test_generates_options_for_request_body(self, petstore_cli):
         """Creates CLI options for request body fields."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
-
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="petstore")
-
-        pet_group = next(g for g in cli.groups if g.name == "pet")
+        pet_group = next(g for g in petstore_cli.groups if g.name == "pet")
 
         # Find POST command (add pet)
         add_cmd = next(
@@ -94,84 +84,122 @@ class TestCLIGenerator:
             # Pet has name, photoUrls, etc.
             assert "--name" in option_names or "--data" in option_names
 
-    def test_generates_auth_options(self):
+    def test_generates_auth_options(self, petstore_cli):
         """Generates authentication options."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
-
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="petstore")
-
         # Should have global auth options
-        global_options = [o.name for o in cli.global_options]
+        global_options = [o.name for o in petstore_cli.global_options]
         assert "--api-key" in global_options or "--token" in global_options
 
-    def test_generates_output_format_option(self):
+    def test_generates_output_format_option(self, petstore_cli):
         """Generates --output option for format selection."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
-
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="petstore")
-
-        global_options = [o.name for o in cli.global_options]
+        global_options = [o.name for o in petstore_cli.global_options]
         assert "--output" in global_options or "-o" in global_options
 
-    def test_exports_to_python_file(self):
+    def test_exports_to_python_file(self, petstore_code):
         """Can export CLI to a Python file."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
-
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="petstore")
-
-        code = cli.to_python()
+        code = petstore_code
 
         assert "import click" in code or "import typer" in code
         assert "def pet" in code or "pet =" in code
         assert "def main" in code or "@app.command" in code
 
-    def test_generated_code_is_valid_python(self):
+    def test_generated_code_is_valid_python(self, petstore_code):
         """Generated code can be compiled."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
+        # Should compile without syntax errors
+        compile(petstore_code, "<generated>", "exec")
 
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="petstore")
+    @pytest.mark.parametrize("spec_fixture,name", [
+        ("petstore_spec", "petstore"),
+        ("httpbin_spec", "httpbin"),
+    ], ids=["petstore", "httpbin"])
+    def test_direct_renderer_matches_template(self, spec_fixture, name, request, monkeypatch):
+        """The direct code generator emits the same code as the Jinja template."""
+        spec = request.getfixturevalue(spec_fixture)
+        cli = CLIGenerator().generate(spec, name=name)
 
-        code = cli.to_python()
+        direct = cli.to_python()
+        monkeypatch.setenv("OPENAPI2CLI_JINJA", "1")
 
-        # Should compile without syntax errors
-        compile(code, "<generated>", "exec")
+        assert direct == cli.to_python()
 
 
 class TestGeneratedCLI:
     """Tests for the GeneratedCLI data class."""
 
-    def test_to_standalone_script(self):
+    def test_to_standalone_script(self, petstore_cli):
         """Can export as standalone executable script."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
-
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="petstore")
-
-        script = cli.to_standalone_script()
+        script = petstore_cli.to_standalone_script()
 
         assert script.startswith("#!/usr/bin/env python3")
         assert "if __name__" in script
 
-    def test_save_to_file(self, tmp_path):
+    def test_save_to_file(self, petstore_cli, tmp_path):
         """Can save generated CLI to a file."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
-
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="petstore")
-
         output_path = tmp_path / "petstore_cli.py"
-        cli.save(output_path)
+        petstore_cli.save(output_path)
 
         assert output_path.exists()
         content = output_path.read_text()
         assert "click" in content or "typer" in content
+
+    def test_load_returns_click_group(self, petstore_cli):
+        """load() builds the CLI in memory, without a script file."""
+        group = petstore_cli.load()
+
+        assert group.name == "cli"
+        assert "pet" in group.commands
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+    def test_save_overwrites_with_executable_mode(self, petstore_cli, tmp_path):
+        """Saving over an existing file replaces it and makes it executable."""
+        output_path = tmp_path / "petstore_cli.py"
+        output_path.write_text("x" * 1_000_000)
+        os.chmod(output_path, 0o600)
+        petstore_cli.save(output_path)
+
+        assert output_path.read_text() == petstore_cli.to_standalone_script()
+        assert stat.S_IMODE(output_path.stat().st_mode) == 0o755
+
+    def test_renderers_agree_on_edge_cases(self, monkeypatch):
+        """Both renderers handle auth variants, defaults and odd names alike."""
+        cli = GeneratedCLI(
+            name="my-api",
+            description="Edge cases",
+            auth_schemes=[
+                AuthScheme(name="key", type="apiKey", location="header", param_name="X-Key"),
+                AuthScheme(name="oauth", type="oauth2"),
+            ],
+            groups=[
+                CLIGroup(name="a.b-c", help="Dotted group", commands=[
+                    CLICommand(
+                        name="get-by.id",
+                        method="POST",
+                        path="/things/{thingId}",
+                        options=[
+                            CLIOption(name="--thing-id", required=True),
+                            CLIOption(name="--limit", default="10", help="Page size"),
+                            CLIOption(name="--data"),
+                        ],
+                        has_body=True,
+                    ),
+                    CLICommand(
+                        name="list",
+                        method="GET",
+                        path="/things",
+                        options=[
+                            CLIOption(name="--sort-by", default=""),
+                            CLIOption(name="--filter.name"),
+                        ],
+                    ),
+                ]),
+                CLIGroup(name="empty"),
+            ],
+        )
+
+        direct = cli.to_python()
+        monkeypatch.setenv("OPENAPI2CLI_JINJA", "1")
+
+        assert direct == cli.to_python()
+        assert 'ENV_PREFIX = "MY_API"' in direct
+        assert "def a_b_c_list(ctx, sort_by, filter_name):" in direct
+        assert "if filter_name is not None:" in direct
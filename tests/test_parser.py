@@ -1,137 +1,242 @@
 """Tests for OpenAPI spec parsing."""
 
+import hashlib
+import json
+import time
 from pathlib import Path
 
+import pytest
+import requests
+
+from openapi2cli import _compat
+from openapi2cli import parser as parser_module
 from openapi2cli.parser import OpenAPIParser, ParsedSpec
 
 FIXTURES = Path(__file__).parent / "fixtures"
+PETSTORE_YAML = FIXTURES / "petstore.yaml"
+HTTPBIN_JSON = FIXTURES / "httpbin.json"
+
+REMOTE_SPEC_URL = "https://httpbin.org/spec.json"
+REMOTE_SPEC_TTL = 24 * 60 * 60
+
+
+@pytest.fixture(scope="session")
+def remote_spec_bytes(request):
+    """The live httpbin spec, kept in pytest's cache for REMOTE_SPEC_TTL seconds."""
+    cache = getattr(request.config, "cache", None)
+    key = "openapi2cli/httpbin-spec"
+    entry = cache.get(key, None) if cache is not None else None
+    if entry and time.time() - entry["fetched"] < REMOTE_SPEC_TTL:
+        return entry["content"].encode("utf-8")
+
+    response = requests.get(REMOTE_SPEC_URL, timeout=30)
+    response.raise_for_status()
+    if cache is not None:
+        cache.set(key, {"fetched": time.time(), "content": response.text})
+    return response.content
+
+
+def _check_endpoint_route(endpoint):
+    """GET /pet/{petId} is extracted from paths."""
+    assert endpoint.method == "GET"
+    assert endpoint.path == "/pet/{petId}"
+
+
+def _check_path_parameter(endpoint):
+    """petId is a required path parameter."""
+    pet_id_param = next((p for p in endpoint.parameters if p.name == "petId"), None)
+    assert pet_id_param is not None
+    assert pet_id_param.location == "path"
+    assert pet_id_param.required is True
+
+
+def _check_request_body(endpoint):
+    """POST /pet has a request body schema with the Pet fields."""
+    assert endpoint.request_body is not None
+    assert "name" in endpoint.request_body.properties
 
 
 class TestOpenAPIParser:
     """Tests for the OpenAPI parser."""
 
-    def test_parse_petstore_yaml(self):
+    def test_parse_petstore_yaml(self, petstore_spec):
         """Can parse a YAML OpenAPI spec."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
-
-        assert isinstance(spec, ParsedSpec)
-        assert spec.title == "OpenAPI Petstore"
-        assert spec.version == "1.0.0"
-        assert spec.base_url == "http://petstore.swagger.io/v2"
+        assert isinstance(petstore_spec, ParsedSpec)
+        assert petstore_spec.title == "OpenAPI Petstore"
+        assert petstore_spec.version == "1.0.0"
+        assert petstore_spec.base_url == "http://petstore.swagger.io/v2"
 
-    def test_parse_httpbin_json(self):
+    def test_parse_httpbin_json(self, httpbin_spec):
         """Can parse a JSON OpenAPI spec."""
+        assert isinstance(httpbin_spec, ParsedSpec)
+        assert httpbin_spec.title == "httpbin.org"
+
+    @pytest.mark.parametrize("backend", ["orjson", "stdlib"])
+    def test_json_backends_agree(self, backend, httpbin_spec, monkeypatch):
+        """JSON specs parse the same with orjson and with the stdlib fallback."""
+        if backend == "orjson":
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(_compat, "orjson", None)
+
+        assert OpenAPIParser().parse(HTTPBIN_JSON) == httpbin_spec
+
+    def test_parse_without_file_extension(self, tmp_path):
+        """Detects JSON vs YAML from the content when there is no suffix."""
         parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "httpbin.json")
 
-        assert isinstance(spec, ParsedSpec)
-        assert spec.title == "httpbin.org"
+        yaml_spec = tmp_path / "petstore"
+        yaml_spec.write_bytes(PETSTORE_YAML.read_bytes())
+        json_spec = tmp_path / "httpbin"
+        json_spec.write_bytes(HTTPBIN_JSON.read_bytes())
+
+        assert parser.parse(yaml_spec).title == "OpenAPI Petstore"
+        assert parser.parse(json_spec).title == "httpbin.org"
+
+    def test_parse_utf16_yaml(self, tmp_path):
+        """YAML specs are handed to the loader as bytes, so any YAML encoding works."""
+        spec_path = tmp_path / "petstore.yaml"
+        spec_path.write_bytes(PETSTORE_YAML.read_text().encode("utf-16"))
 
-    def test_parse_from_url(self):
+        assert OpenAPIParser().parse(spec_path).title == "OpenAPI Petstore"
+
+    def test_parse_from_url(self, httpbin_stub):
         """Can parse a spec from a URL."""
         parser = OpenAPIParser()
-        spec = parser.parse("https://httpbin.org/spec.json")
+        spec = parser.parse(httpbin_stub.url_for("/spec.json"))
 
         assert spec.title == "httpbin.org"
 
-    def test_extracts_endpoints(self):
-        """Extracts endpoints from paths."""
+    def test_parse_from_bytes(self):
+        """Can parse spec content passed directly as bytes."""
         parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
 
-        assert len(spec.endpoints) > 0
+        assert parser.parse(PETSTORE_YAML.read_bytes()).title == "OpenAPI Petstore"
+        assert parser.parse(HTTPBIN_JSON.read_bytes()).title == "httpbin.org"
 
-        # Find the listPets endpoint
-        list_pets = next(
-            (e for e in spec.endpoints if e.operation_id == "getPetById"),
-            None
-        )
-        assert list_pets is not None
-        assert list_pets.method == "GET"
-        assert list_pets.path == "/pet/{petId}"
+    @pytest.mark.network
+    def test_parse_remote_spec(self, remote_spec_bytes):
+        """Parses the live httpbin spec (fetched at most once a day)."""
+        spec = OpenAPIParser().parse(remote_spec_bytes)
 
-    def test_extracts_parameters(self):
-        """Extracts parameters from endpoints."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
-
-        # Find endpoint with path parameter
-        get_pet = next(
-            (e for e in spec.endpoints if e.operation_id == "getPetById"),
-            None
-        )
-        assert get_pet is not None
-
-        # Should have petId as path parameter
-        pet_id_param = next(
-            (p for p in get_pet.parameters if p.name == "petId"),
-            None
-        )
-        assert pet_id_param is not None
-        assert pet_id_param.location == "path"
-        assert pet_id_param.required is True
-
-    def test_extracts_request_body(self):
-        """Extracts request body schema from endpoints."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
-
-        # Find POST /pet endpoint
-        add_pet = next(
-            (e for e in spec.endpoints if e.operation_id == "addPet"),
-            None
-        )
-        assert add_pet is not None
-        assert add_pet.request_body is not None
-        assert "name" in add_pet.request_body.properties
-
-    def test_extracts_auth_schemes(self):
-        """Extracts authentication schemes."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
+        assert spec.title == "httpbin.org"
 
-        assert len(spec.auth_schemes) > 0
+    @pytest.mark.parametrize("op_id,check", [
+        ("getPetById", _check_endpoint_route),
+        ("getPetById", _check_path_parameter),
+        ("addPet", _check_request_body),
+    ], ids=["endpoints", "parameters", "request-body"])
+    def test_extracts_operation(self, petstore_spec, petstore_ops, op_id, check):
+        """Extracts endpoints, their parameters and request bodies."""
+        assert len(petstore_spec.endpoints) > 0
+        check(petstore_ops[op_id])
+
+    def test_extracts_auth_schemes(self, petstore_spec):
+        """Extracts authentication schemes."""
+        assert len(petstore_spec.auth_schemes) > 0
         # Petstore uses api_key and oauth2
-        scheme_types = [s.type for s in spec.auth_schemes]
+        scheme_types = [s.type for s in petstore_spec.auth_schemes]
         assert "apiKey" in scheme_types or "oauth2" in scheme_types
 
-    def test_groups_endpoints_by_tag(self):
-        """Groups endpoints by their tags."""
+    def test_resolves_chained_refs(self, tmp_path):
+        """Follows $refs that point at other $refs, without looping on cycles."""
+        spec_path = tmp_path / "refs.json"
+        spec_path.write_text(json.dumps({
+            "openapi": "3.0.0",
+            "info": {"title": "Refs", "version": "1.0.0"},
+            "paths": {
+                "/items/{itemId}": {
+                    "get": {
+                        "operationId": "getItem",
+                        "parameters": [
+                            {"$ref": "#/components/parameters/ItemIdAlias"},
+                            {"$ref": "#/components/parameters/Loop"},
+                        ],
+                    },
+                },
+            },
+            "components": {
+                "parameters": {
+                    "ItemIdAlias": {"$ref": "#/components/parameters/ItemId"},
+                    "ItemId": {
+                        "name": "itemId",
+                        "in": "path",
+                        "required": True,
+                        "schema": {"$ref": "#/components/schemas/Id"},
+                    },
+                    "Loop": {"$ref": "#/components/parameters/Loop"},
+                },
+                "schemas": {"Id": {"type": "integer"}},
+            },
+        }))
+
+        spec = OpenAPIParser().parse(spec_path)
+
+        item_id, loop = spec.endpoints[0].parameters
+        assert item_id.name == "itemId"
+        assert item_id.location == "path"
+        assert item_id.schema_type == "integer"
+        assert loop.name == ""
+
+    def test_caches_parsed_spec(self, tmp_path, monkeypatch):
+        """Reuses the on-disk cache for unchanged spec content."""
+        monkeypatch.delenv("OPENAPI2CLI_NO_CACHE", raising=False)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
         parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
 
-        grouped = spec.group_by_tag()
+        first = parser.parse(PETSTORE_YAML)
+        cached = list((tmp_path / "openapi2cli" / "specs").glob("*.pickle"))
+        second = parser.parse(PETSTORE_YAML)
+
+        assert len(cached) == 1
+        assert second == first
+        assert second is not first
+
+    def test_skips_cache_when_disabled(self, tmp_path, monkeypatch):
+        """OPENAPI2CLI_NO_CACHE turns the spec cache off."""
+        monkeypatch.setenv("OPENAPI2CLI_NO_CACHE", "1")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        OpenAPIParser().parse(PETSTORE_YAML)
+
+        assert not (tmp_path / "openapi2cli").exists()
+
+    def test_cache_key_tracks_parser_source(self):
+        """Spec cache keys change whenever the parser code changes."""
+        source_hash = hashlib.sha256(Path(parser_module.__file__).read_bytes()).hexdigest()
+
+        assert source_hash.encode() in parser_module._spec_cache_key()
+
+    def test_groups_endpoints_by_tag(self, petstore_spec):
+        """Groups endpoints by their tags."""
+        grouped = petstore_spec.group_by_tag()
 
         assert "pet" in grouped
         assert "store" in grouped
         assert "user" in grouped
         assert len(grouped["pet"]) > 0
 
+    def test_group_by_tag_is_computed_once(self, petstore_spec):
+        """Repeated group_by_tag() calls return the same cached mapping."""
+        grouped = petstore_spec.group_by_tag()
+
+        assert petstore_spec.group_by_tag() is grouped
+        assert petstore_spec.grouped_by_tag is grouped
+
 
 class TestParsedSpec:
     """Tests for the ParsedSpec data class."""
 
-    def test_to_cli_name(self):
+    def test_to_cli_name(self, petstore_ops):
         """Converts operation IDs to CLI-friendly names."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "petstore.yaml")
-
-        endpoint = next(
-            (e for e in spec.endpoints if e.operation_id == "getPetById"),
-            None
-        )
-        assert endpoint is not None
+        endpoint = petstore_ops["getPetById"]
         # getPetById -> get-pet-by-id or get
         assert endpoint.cli_name in ["get-pet-by-id", "get", "get-by-id"]
 
-    def test_infers_cli_name_from_method_and_path(self):
+    def test_infers_cli_name_from_method_and_path(self, httpbin_spec):
         """Infers CLI name when operationId is missing."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "httpbin.json")
-
         # HTTPBin endpoints might not have operationIds
         # Should still generate usable names
-        for endpoint in spec.endpoints[:5]:
+        for endpoint in httpbin_spec.endpoints[:5]:
             assert endpoint.cli_name is not None
             assert len(endpoint.cli_name) > 0
@@ -1,41 +1,57 @@
 """Tests for CLI runtime (actual API execution)."""
 
-from pathlib import Path
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
+from requests.adapters import HTTPAdapter
 
-from openapi2cli.generator import CLIGenerator
-from openapi2cli.parser import OpenAPIParser
-from openapi2cli.runtime import APIClient, CLIRunner
+from openapi2cli import runtime
+from openapi2cli.runtime import APIClient, CLIRunner, get_session
 
-FIXTURES = Path(__file__).parent / "fixtures"
+
+@pytest.fixture(scope="class")
+def api_client(httpbin_stub):
+    """One client (and pooled connection) for every test in a class."""
+    return APIClient(base_url=httpbin_stub.url_for("/"))
 
 
 class TestAPIClient:
     """Tests for the API client runtime."""
 
-    def test_makes_get_request(self):
+    def test_makes_get_request(self, api_client):
         """Can make a GET request."""
-        client = APIClient(base_url="https://httpbin.org")
-
-        response = client.get("/get", params={"foo": "bar"})
+        response = api_client.get("/get", params={"foo": "bar"})
 
         assert response.status_code == 200
         assert response.json()["args"]["foo"] == "bar"
 
-    def test_makes_post_request(self):
+    def test_makes_post_request(self, api_client):
         """Can make a POST request with JSON body."""
-        client = APIClient(base_url="https://httpbin.org")
-
-        response = client.post("/post", json_data={"name": "test"})
+        response = api_client.post("/post", json_data={"name": "test"})
 
         assert response.status_code == 200
         assert response.json()["json"]["name"] == "test"
 
-    def test_handles_auth_header(self):
+    def test_request_json_decodes_body(self, api_client):
+        """request_json returns the parsed JSON body."""
+        data = api_client.request_json("GET", "/get", params={"foo": "bar"})
+
+        assert data["args"]["foo"] == "bar"
+
+    def test_batch_returns_responses_in_order(self, api_client):
+        """batch() runs requests concurrently and keeps their order."""
+        responses = api_client.batch(
+            {"method": "GET", "path": "/get", "params": {"n": str(i)}} for i in range(4)
+        )
+
+        assert [r.json()["args"]["n"] for r in responses] == ["0", "1", "2", "3"]
+
+    def test_handles_auth_header(self, httpbin_stub):
         """Includes auth header when configured."""
         client = APIClient(
-            base_url="https://httpbin.org",
+            base_url=httpbin_stub.url_for("/"),
             auth_header="Authorization",
             auth_value="Bearer test-token"
         )
@@ -47,10 +63,10 @@ class TestAPIClient:
         assert "Authorization" in headers
         assert headers["Authorization"] == "Bearer test-token"
 
-    def test_handles_api_key_query_param(self):
+    def test_handles_api_key_query_param(self, httpbin_stub):
         """Includes API key as query param when configured."""
         client = APIClient(
-            base_url="https://httpbin.org",
+            base_url=httpbin_stub.url_for("/"),
             api_key_param="api_key",
             api_key_value="test-key"
         )
@@ -60,11 +76,9 @@ class TestAPIClient:
         assert response.status_code == 200
         assert response.json()["args"]["api_key"] == "test-key"
 
-    def test_handles_path_parameters(self):
+    def test_handles_path_parameters(self, api_client):
         """Substitutes path parameters."""
-        client = APIClient(base_url="https://httpbin.org")
-
-        response = client.get(
+        response = api_client.get(
             "/anything/{id}",
             path_params={"id": "123"}
         )
@@ -72,62 +86,216 @@ class TestAPIClient:
         assert response.status_code == 200
         assert "/anything/123" in response.json()["url"]
 
+    def test_builds_url_with_path_params(self):
+        """Substitutes known path params and leaves unknown placeholders."""
+        client = APIClient(base_url="https://api.example/")
+
+        url = client._build_url("/a/{id}/b/{other}/{id}", {"id": 7})
+
+        assert url == "https://api.example/a/7/b/{other}/7"
+        assert client._build_url("/plain", {"id": 7}) == "https://api.example/plain"
+
+    def test_mounts_adapter_per_host(self):
+        """Each API host gets a pooled adapter, reused for equal settings."""
+        first = APIClient(base_url="https://pool.example/v1", pool_size=32)
+        adapter = first.session.get_adapter("https://pool.example/v1/things")
+        APIClient(base_url="https://pool.example/v2", pool_size=32)
+
+        assert adapter._pool_maxsize == 32
+        assert first.session.get_adapter("https://pool.example/x") is adapter
+        assert first.session.get_adapter("https://other.example/") is not adapter
+
+        third = APIClient(base_url="https://pool.example", retries=3)
+        assert third.session.get_adapter("https://pool.example/x") is adapter
+        assert adapter.max_retries.total == 3
+        assert adapter._pool_maxsize == 32
+
+    def test_never_shrinks_mounted_pool(self, monkeypatch):
+        """A client asking for a smaller pool keeps the larger mounted one."""
+        big = APIClient(base_url="https://shrink.example", pool_size=16)
+        adapter = big.session.get_adapter("https://shrink.example/")
+        small = APIClient(base_url="https://shrink.example", pool_size=2)
+
+        assert small.session.get_adapter("https://shrink.example/") is adapter
+        assert adapter._pool_maxsize == 16
+
+        workers = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def __init__(self, max_workers):
+                workers.append(max_workers)
+                super().__init__(max_workers=max_workers)
+
+        monkeypatch.setattr("openapi2cli.runtime.ThreadPoolExecutor", RecordingExecutor)
+        small.batch([], max_workers=8)
+        assert workers == [8]
+
+    def test_grows_pool_in_place(self, monkeypatch):
+        """A bigger pool reconfigures the host's adapter and drops the old pools."""
+        first = APIClient(base_url="https://grow.example", pool_size=4)
+        adapter = first.session.get_adapter("https://grow.example/")
+        cleared = []
+        monkeypatch.setattr(adapter.poolmanager, "clear", lambda: cleared.append(True))
+
+        APIClient(base_url="https://grow.example", pool_size=12)
+
+        assert cleared == [True]
+        assert first.session.get_adapter("https://grow.example/") is adapter
+        assert adapter._pool_maxsize == 12
+
+    def test_caller_adapters_take_precedence(self, monkeypatch):
+        """Adapters mounted on the shared session are never replaced or shadowed."""
+        shared = get_session()
+        own = HTTPAdapter(max_retries=4)
+        shared.mount("https://own.example/", own)
+        client = APIClient(base_url="https://own.example", pool_size=50, retries=1)
+
+        assert client.session.get_adapter("https://own.example/x") is own
+        assert own.max_retries.total == 4
+
+        scheme_wide = HTTPAdapter(max_retries=5)
+        monkeypatch.setitem(shared.adapters, "https://", scheme_wide)
+        client = APIClient(base_url="https://scheme.example", retries=1)
+
+        assert client.session.get_adapter("https://scheme.example/x") is scheme_wide
+
+    def test_host_adapters_are_bounded(self, monkeypatch):
+        """Past the limit, new hosts share the default adapter."""
+        monkeypatch.setattr(runtime, "_MAX_HOST_ADAPTERS", len(runtime._HOST_ADAPTERS))
+        client = APIClient(base_url="https://overflow.example")
+
+        assert client.session.get_adapter("https://overflow.example/") is (
+            get_session().get_adapter("https://")
+        )
+        assert "https://overflow.example/" not in runtime._HOST_ADAPTERS
+
+    def test_clients_share_pooled_session(self):
+        """All clients reuse the shared connection pools; auth stays per client."""
+        first = APIClient(base_url="https://a.example", auth_header="X-Key", auth_value="a")
+        second = APIClient(base_url="https://b.example")
+
+        shared = get_session().get_adapter("https://b.example/")
+
+        assert first.session is not second.session
+        assert first.session.adapters is not get_session().adapters
+        assert second.session.get_adapter("https://b.example/") is shared
+        assert first.session.headers["Content-Type"] == "application/json"
+        assert first._get_headers()["X-Key"] == "a"
+        assert "X-Key" not in second._get_headers()
+        assert "X-Key" not in get_session().headers
+
+    def test_mounting_hosts_does_not_disturb_live_clients(self):
+        """Creating clients for new hosts is safe while others look up adapters."""
+        client = APIClient(base_url="https://busy.example")
+        errors = []
+        done = threading.Event()
+
+        def resolve():
+            try:
+                while not done.is_set():
+                    client.session.get_adapter("https://busy.example/x")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=resolve) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        try:
+            for i in range(200):
+                APIClient(base_url=f"https://host-{i}.busy.example")
+        finally:
+            done.set()
+            for thread in threads:
+                thread.join()
+
+        assert errors == []
+
+    def test_clients_do_not_share_cookies(self, httpbin_stub):
+        """Cookies set for one client are never sent by another."""
+        base_url = httpbin_stub.url_for("/")
+        alice = APIClient(base_url=base_url, auth_header="X-Key", auth_value="alice")
+        alice.get("/cookies/set", params={"session": "user-a"})
+        bob = APIClient(base_url=base_url, auth_header="X-Key", auth_value="bob")
+
+        assert "Cookie" not in bob.get("/get").json()["headers"]
+        assert alice.get("/get").json()["headers"]["Cookie"] == "session=user-a"
+        assert len(get_session().cookies) == 0
+
 
 @pytest.mark.integration
 class TestCLIRunner:
     """Integration tests for CLI execution."""
 
-    def test_run_generated_cli_help(self, tmp_path):
+    def test_run_generated_cli_help(self, httpbin_cli_script):
         """Generated CLI --help works."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "httpbin.json")
-
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="httpbin")
+        runner = CLIRunner(httpbin_cli_script)
+        result = runner.invoke(["--help"])
 
-        # Save and run
-        script = tmp_path / "httpbin_cli.py"
-        cli.save(script)
+        assert result.exit_code == 0
+        assert "httpbin" in result.output.lower() or "usage" in result.output.lower()
 
-        runner = CLIRunner(script)
+    def test_run_in_subprocess(self, httpbin_cli_script):
+        """The saved script also runs as its own process."""
+        runner = CLIRunner(httpbin_cli_script)
         result = runner.run(["--help"])
 
         assert result.exit_code == 0
-        assert "httpbin" in result.output.lower() or "usage" in result.output.lower()
+        assert result.output == runner.invoke(["--help"]).output
 
-    def test_run_generated_cli_command(self, tmp_path):
+    def test_run_generated_cli_command(self, httpbin_cli_script, httpbin_stub):
         """Generated CLI can execute a command."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "httpbin.json")
-
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="httpbin")
-
-        script = tmp_path / "httpbin_cli.py"
-        cli.save(script)
-
+        runner = CLIRunner(httpbin_cli_script)
+        # Run a simple GET endpoint against the local stub
+        result = runner.invoke([
+            "--base-url", httpbin_stub.url_for("/"),
+            "http-methods", "get-get",
+        ])
+
+        assert result.exit_code == 0, result.error
+        assert "/get" in result.output
+
+    def test_session_reuses_worker(self, httpbin_cli_script):
+        """runner.session() answers repeated calls from one interpreter."""
+        runner = CLIRunner(httpbin_cli_script)
+        with runner.session():
+            first = runner.run(["--help"])
+            bad = runner.run(["no-such-command"])
+            second = runner.run(["--help"], env={"HTTPBIN_API_KEY": "test-key"})
+
+        assert first.exit_code == 0
+        assert "usage" in first.output.lower()
+        assert bad.exit_code == 2
+        assert "no-such-command" in bad.error
+        assert second == first
+        assert runner.run(["--help"]) == first
+
+    def test_session_times_out_hung_command(self, tmp_path, monkeypatch):
+        """A command that hangs in the worker is killed like a one-shot run."""
+        script = tmp_path / "hang_cli.py"
+        script.write_text(
+            "import time\n"
+            "import click\n\n\n"
+            "@click.group()\n"
+            "def cli():\n"
+            "    pass\n\n\n"
+            "@cli.command()\n"
+            "def hang():\n"
+            "    time.sleep(60)\n"
+        )
         runner = CLIRunner(script)
-        # Try to run a simple GET endpoint
-        result = runner.run(["get", "--output", "json"])
+        with runner.session():
+            monkeypatch.setattr(runtime, "_RUN_TIMEOUT", 0.5)
+            with pytest.raises(subprocess.TimeoutExpired):
+                runner.run(["hang"])
 
-        # Should succeed or fail gracefully
-        assert result.exit_code in [0, 1, 2]  # 0=success, 1=api error, 2=usage error
+            assert runner._worker is None
 
-    def test_run_with_env_auth(self, tmp_path, monkeypatch):
+    def test_run_with_env_auth(self, httpbin_cli_script, monkeypatch):
         """CLI reads auth from environment."""
-        parser = OpenAPIParser()
-        spec = parser.parse(FIXTURES / "httpbin.json")
-
-        generator = CLIGenerator()
-        cli = generator.generate(spec, name="httpbin")
-
-        script = tmp_path / "httpbin_cli.py"
-        cli.save(script)
-
         # Set auth via env
         monkeypatch.setenv("HTTPBIN_API_KEY", "test-key")
 
-        runner = CLIRunner(script)
-        result = runner.run(["--help"])
+        runner = CLIRunner(httpbin_cli_script)
+        result = runner.invoke(["--help"])
 
         assert result.exit_code == 0